@@ -2,23 +2,95 @@
 
 from __future__ import annotations
 
+import copy
+from datetime import timedelta
+import hashlib
+from pathlib import Path
+import uuid
+
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
-from homeassistant.const import Platform
+from homeassistant.const import CONF_EMAIL, EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from . import websocket_api
+from .blocking import BlockingMonitor
+from .cassette import CASSETTE_MODES, CASSETTE_RECORD, Cassette
+from .checkin import RyanairCheckInScheduler
+from .client import async_get_client
+from .const import (
+    AIRPORTS,
+    ARCHIVER,
+    BLOCKING_MONITOR,
+    BOARDING_PASS_COORDINATOR,
+    BOOKING_DETAILS_COORDINATOR,
+    BOOKING_STORE,
+    CASSETTE,
+    CLIENTS,
+    CONF_ARCHIVE_DAYS,
+    CONF_BASE_URL,
+    CONF_CASSETTE,
+    CONF_CASSETTE_MODE,
+    CONF_CHECK_IN_REFRESH,
+    CONF_DEBUG_BLOCKING,
+    CONF_HISTORY,
+    COORDINATORS,
+    DEFAULT_ARCHIVE_DAYS,
+    DOMAIN,
+    FLIGHTS_COORDINATOR,
+    HISTORY_COORDINATOR,
+    PROFILE_COORDINATOR,
+    SELECTED_PASSENGERS,
+    SIGNAL_ACCOUNTS_CHANGED,
+)
+from .coordinator import (
+    RyanairBoardingPassCoordinator,
+    RyanairBookingDetailsCoordinator,
+    RyanairFlightsCoordinator,
+    RyanairHistoryCoordinator,
+    RyanairProfileCoordinator,
+)
+from .export import RyanairExportView
+from .lifecycle import RyanairArchiver
+from .scheduler import async_get_scheduler
+from .services import async_setup_services
+from .store import RyanairBookingStore
+
+PLATFORMS = [Platform.CALENDAR, Platform.IMAGE, Platform.SELECT, Platform.SENSOR]
+CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(DOMAIN): vol.Schema(
+            {
+                # Point the integration at a stand-in API, e.g. scripts/mock_api.py
+                vol.Optional(CONF_BASE_URL): cv.url,
+                # Capture API traffic to, or replay it from, a redacted cassette file
+                vol.Inclusive(CONF_CASSETTE, "cassette"): cv.string,
+                vol.Inclusive(CONF_CASSETTE_MODE, "cassette"): vol.In(CASSETTE_MODES),
+                # Log the code paths that block the event loop, see blocking.py
+                vol.Optional(CONF_DEBUG_BLOCKING, default=False): cv.boolean,
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
-PLATFORMS = [Platform.IMAGE, Platform.SENSOR]
-CONFIG_SCHEMA = cv.empty_config_schema(DOMAIN)
+def generate_device_fingerprint(email: str) -> str:
+    """Generate device fingerprint."""
+    unique_id = hashlib.md5(email.encode("UTF-8")).hexdigest()
+    return str(uuid.UUID(hex=unique_id))
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up platform from a ConfigEntry."""
     hass.data.setdefault(DOMAIN, {})
-    hass_data = dict(entry.data)
+    # A deep copy, so refreshed credentials never change entry.data in place.
+    hass_data = copy.deepcopy(dict(entry.data))
 
     # Registers update listener to update config entry when options are updated.
     unsub_options_update_listener = entry.add_update_listener(options_update_listener)
@@ -26,14 +98,125 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Use async_on_unload to register the listener without storing it in entry data
     entry.async_on_unload(unsub_options_update_listener)
 
-    # Store other necessary data in hass.data, without the listener function
+    fingerprint = generate_device_fingerprint(entry.data[CONF_EMAIL])
+    client = async_get_client(hass, fingerprint)
+    scheduler = async_get_scheduler(hass)
+
+    # Give the account its own phase in the shared refresh schedule.
+    entry.async_on_unload(scheduler.async_add_account(fingerprint))
+
+    # Bookings that have landed are served from disk rather than the API.
+    store = RyanairBookingStore(hass, fingerprint)
+    await store.async_load()
+
+    store.keepHistory = entry.options.get(CONF_HISTORY, False)
+    if not store.keepHistory:
+        store.async_clear_history()
+
+    profileCoordinator = RyanairProfileCoordinator(hass, client, hass_data, fingerprint)
+    flightsCoordinator = RyanairFlightsCoordinator(
+        hass, client, hass_data, fingerprint, store
+    )
+    bookingDetailsCoordinator = RyanairBookingDetailsCoordinator(
+        hass, client, hass_data, fingerprint, store, flightsCoordinator
+    )
+    boardingPassCoordinator = RyanairBoardingPassCoordinator(
+        hass, client, hass_data, fingerprint, store, bookingDetailsCoordinator
+    )
+
+    monitor = hass.data[DOMAIN].get(BLOCKING_MONITOR)
+    if monitor is not None:
+        for coordinator in (
+            profileCoordinator,
+            flightsCoordinator,
+            bookingDetailsCoordinator,
+            boardingPassCoordinator,
+        ):
+            monitor.async_monitor_coordinator(coordinator)
+
+    # Booking details are refreshed straight after the flights they belong to.
+    for coordinator in (
+        profileCoordinator,
+        flightsCoordinator,
+        bookingDetailsCoordinator,
+    ):
+        scheduler.async_add_coordinator(fingerprint, coordinator)
+        await coordinator.async_config_entry_first_refresh()
+
+    await boardingPassCoordinator.async_config_entry_first_refresh()
+
+    # Store other necessary data in hass.data, without the listener function.
+    # Only done once the first refreshes succeeded, so a setup that is retried
+    # leaves nothing behind.
     hass.data[DOMAIN][entry.entry_id] = hass_data
 
+    coordinators = hass.data[DOMAIN].setdefault(COORDINATORS, {})[fingerprint] = {
+        PROFILE_COORDINATOR: profileCoordinator,
+        FLIGHTS_COORDINATOR: flightsCoordinator,
+        BOOKING_DETAILS_COORDINATOR: bookingDetailsCoordinator,
+        BOARDING_PASS_COORDINATOR: boardingPassCoordinator,
+        BOOKING_STORE: store,
+        SELECTED_PASSENGERS: {},
+    }
+
+    # Bookings that ended longer ago than the grace period get no entities.
+    archiver = RyanairArchiver(
+        hass,
+        entry,
+        store,
+        flightsCoordinator,
+        timedelta(days=entry.options.get(CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS)),
+    )
+    coordinators[ARCHIVER] = archiver
+
+    if store.keepHistory:
+        historyCoordinator = RyanairHistoryCoordinator(
+            hass, client, hass_data, fingerprint, store
+        )
+        if monitor is not None:
+            monitor.async_monitor_coordinator(historyCoordinator)
+        scheduler.async_add_coordinator(fingerprint, historyCoordinator)
+        # A failed backfill is retried on the next cycle rather than
+        # holding up the entry.
+        await historyCoordinator.async_refresh()
+        coordinators[HISTORY_COORDINATOR] = historyCoordinator
+
     # Forward the setup to the sensor platform.
     try:
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     except TimeoutError as ex:
+        # The entry is not unloaded before the retry, so nothing may be left.
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        hass.data[DOMAIN][COORDINATORS].pop(fingerprint, None)
+        await store.async_unload()
         raise ConfigEntryNotReady("Timeout while loading config entry for") from ex
+
+    archiver.async_prune()
+    entry.async_on_unload(flightsCoordinator.async_add_listener(archiver.async_prune))
+
+    # Passes are fetched as soon as a passenger checks in.
+    boardingPassCoordinator.async_check_in_changed()
+    entry.async_on_unload(
+        bookingDetailsCoordinator.async_add_listener(
+            boardingPassCoordinator.async_check_in_changed
+        )
+    )
+
+    # Announce every check-in window as it opens.
+    checkInScheduler = RyanairCheckInScheduler(
+        hass,
+        entry,
+        coordinators,
+        client,
+        entry.options.get(CONF_CHECK_IN_REFRESH, False),
+    )
+    checkInScheduler.async_schedule()
+    entry.async_on_unload(
+        flightsCoordinator.async_add_listener(checkInScheduler.async_schedule)
+    )
+    entry.async_on_unload(checkInScheduler.async_cancel_all)
+
+    async_dispatcher_send(hass, SIGNAL_ACCOUNTS_CHANGED)
     return True
 
 
@@ -48,13 +231,59 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     # Remove config entry from domain.
+    # The coordinators shut themselves down with the entry, and the account is
+    # taken out of the scheduler, cancelling any refresh in flight, by the
+    # callback registered at setup.
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        domainData = hass.data[DOMAIN]
+        fingerprint = generate_device_fingerprint(entry.data[CONF_EMAIL])
+        domainData.pop(entry.entry_id)
+        domainData.get(CLIENTS, {}).pop(fingerprint, None)
+        coordinators = domainData[COORDINATORS].pop(fingerprint, {})
+
+        if BOOKING_STORE in coordinators:
+            await coordinators[BOOKING_STORE].async_unload()
+
+        # The airport table is only worth its memory while an account uses it.
+        if not domainData[COORDINATORS]:
+            domainData.pop(AIRPORTS, None)
+
+        async_dispatcher_send(hass, SIGNAL_ACCOUNTS_CHANGED)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored bookings of a removed account."""
+    await RyanairBookingStore(
+        hass, generate_device_fingerprint(entry.data[CONF_EMAIL])
+    ).async_remove()
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Ryanair Custom component from yaml configuration."""
     hass.data.setdefault(DOMAIN, {})
+    websocket_api.async_setup(hass)
+    async_setup_services(hass)
+    hass.http.register_view(RyanairExportView)
+
+    if DOMAIN in config and CONF_BASE_URL in config[DOMAIN]:
+        hass.data[DOMAIN][CONF_BASE_URL] = config[DOMAIN][CONF_BASE_URL]
+
+    if DOMAIN in config and CONF_CASSETTE in config[DOMAIN]:
+        cassette = Cassette(
+            hass,
+            Path(hass.config.path(config[DOMAIN][CONF_CASSETTE])),
+            config[DOMAIN][CONF_CASSETTE_MODE],
+        )
+        if cassette.mode != CASSETTE_RECORD:
+            await cassette.async_load()
+        hass.data[DOMAIN][CASSETTE] = cassette
+
+    if DOMAIN in config and config[DOMAIN][CONF_DEBUG_BLOCKING]:
+        monitor = BlockingMonitor(hass)
+        monitor.async_start()
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, monitor.async_stop)
+        hass.data[DOMAIN][BLOCKING_MONITOR] = monitor
+
     return True
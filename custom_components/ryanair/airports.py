@@ -0,0 +1,153 @@
+"""Bundled airport table."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from math import asin, cos, radians, sin, sqrt
+from pathlib import Path
+import struct
+from typing import NamedTuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import AIRPORTS, DOMAIN
+
+AIRPORTS_FILE = Path(__file__).parent / "airports.bin"
+# The file, generated by scripts/build_airports.py, is a header, then one
+# record per airport sorted by IATA code, then the NUL terminated names,
+# cities and time zones the records point at by offset.
+MAGIC = b"IATA"
+HEADER = struct.Struct("<4sI")
+RECORD = struct.Struct("<3sffIII")
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Airport(NamedTuple):
+    """An airport from the bundled table."""
+
+    iata: str
+    name: str
+    city: str
+    tz: str
+    lat: float
+    lon: float
+
+
+class AirportTable:
+    """Location, name and time zone of every airport with an IATA code.
+
+    The table is kept as the raw bytes of the bundled file and searched in
+    place, so loading it costs a single read, lookups take O(log n) and only
+    the airports actually looked up are ever decoded.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize."""
+        magic, self._count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not an airport table")
+
+        self._data = data
+        self._strings = HEADER.size + self._count * RECORD.size
+        self._airports: dict[str, Airport | None] = {}
+        self._distances: dict[tuple[str, str], float | None] = {}
+
+    def __len__(self) -> int:
+        """Return the number of airports."""
+        return self._count
+
+    def __contains__(self, iata: str) -> bool:
+        """Return True if the airport is known."""
+        return self._find(iata) is not None
+
+    def _find(self, iata: str) -> int | None:
+        """Return the offset of an airport's record."""
+        code = iata.upper().encode("ascii", "ignore")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * RECORD.size
+            current = self._data[offset : offset + 3]
+            if current == code:
+                return offset
+            if current < code:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _string(self, offset: int) -> str:
+        """Return a string from the string section."""
+        start = self._strings + offset
+        return self._data[start : self._data.index(b"\0", start)].decode("UTF-8")
+
+    def get(self, iata: str) -> Airport | None:
+        """Return an airport by IATA code."""
+        if iata not in self._airports:
+            offset = self._find(iata)
+            if offset is None:
+                self._airports[iata] = None
+            else:
+                code, lat, lon, name, city, tz = RECORD.unpack_from(self._data, offset)
+                self._airports[iata] = Airport(
+                    code.decode("ascii"),
+                    self._string(name),
+                    self._string(city),
+                    self._string(tz),
+                    lat,
+                    lon,
+                )
+        return self._airports[iata]
+
+    def coordinates(self, iata: str) -> tuple[float, float] | None:
+        """Return the latitude and longitude of an airport."""
+        airport = self.get(iata)
+        return None if airport is None else (airport.lat, airport.lon)
+
+    def localTime(self, iata: str, moment: datetime) -> datetime | None:
+        """Return a moment in the local time of an airport."""
+        airport = self.get(iata)
+        if airport is None or (tz := dt_util.get_time_zone(airport.tz)) is None:
+            return None
+        return moment.astimezone(tz)
+
+    def distance(self, origin: str, destination: str) -> float | None:
+        """Return the great-circle distance between two airports in km.
+
+        Travellers fly the same few routes over and over, so each route is
+        only computed once.
+        """
+        route = (origin, destination)
+        if route not in self._distances:
+            start = self.coordinates(origin)
+            end = self.coordinates(destination)
+            self._distances[route] = (
+                None if start is None or end is None else greatCircle(start, end)
+            )
+        return self._distances[route]
+
+
+def greatCircle(start: tuple[float, float], end: tuple[float, float]) -> float:
+    """Return the haversine distance between two points in km."""
+    lat1, lon1, lat2, lon2 = map(radians, (*start, *end))
+    a = (
+        sin((lat2 - lat1) / 2) ** 2
+        + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+def loadAirports() -> AirportTable:
+    """Read the bundled table."""
+    return AirportTable(AIRPORTS_FILE.read_bytes())
+
+
+async def async_get_airports(hass: HomeAssistant) -> AirportTable:
+    """Return the airport table, reading it on first use."""
+    domainData = hass.data.setdefault(DOMAIN, {})
+
+    if AIRPORTS not in domainData:
+        domainData[AIRPORTS] = await hass.async_add_executor_job(loadAirports)
+
+    return domainData[AIRPORTS]
@@ -0,0 +1,230 @@
+"""Detection of code blocking the event loop, for debugging."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from functools import wraps
+import heapq
+from itertools import count
+import logging
+import sys
+import threading
+import time
+import traceback
+import types
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import BLOCKING_MONITOR, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+# A stretch of code running this long without yielding to the loop counts as
+# blocking it, as with asyncio's own slow callback warning.
+BLOCKING_THRESHOLD = 0.1
+# The loop's stack is sampled this often while a stretch is running.
+SAMPLE_INTERVAL = 0.02
+MAX_SAMPLES = 50
+STACK_DEPTH = 30
+# The worst stretches kept for the diagnostics.
+WORST_KEPT = 10
+
+
+@dataclass(slots=True)
+class Segment:
+    """A stretch of a monitored coroutine between two yields to the loop."""
+
+    label: str
+    start: float
+    duration: float = 0.0
+    at: str | None = None
+    samples: list[tuple[str, ...]] = field(default_factory=list)
+
+    def stacks(self, limit: int = 3) -> list[dict[str, Any]]:
+        """Return the stacks sampled most often."""
+        return [
+            {"count": samples, "stack": list(stack)}
+            for stack, samples in Counter(self.samples).most_common(limit)
+        ]
+
+
+@dataclass(slots=True)
+class LabelStats:
+    """How much one monitored code path has blocked the loop."""
+
+    calls: int = 0
+    blocking: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+
+
+class BlockingMonitor:
+    """Measures how long monitored coroutines hold the event loop.
+
+    Each coroutine is stepped through by hand, timing every stretch between
+    two yields to the loop. While a stretch runs, a background thread samples
+    the loop thread's stack, so stretches over BLOCKING_THRESHOLD are logged
+    with where the time went. The worst are kept for the diagnostics.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.stats: dict[str, LabelStats] = {}
+        # (duration, sequence, segment) of the worst stretches, smallest first.
+        self._worst: list[tuple[float, int, Segment]] = []
+        self._sequence = count()
+        self._current: Segment | None = None
+        self._loopThread = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start sampling the loop thread."""
+        self._sampler = threading.Thread(
+            target=self._sample, name=f"{DOMAIN} blocking monitor", daemon=True
+        )
+        self._sampler.start()
+
+    @callback
+    def async_stop(self, *_args: Any) -> None:
+        """Stop sampling."""
+        self._stop.set()
+
+    def _sample(self) -> None:
+        """Record the loop thread's stack while a stretch runs too long."""
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            segment = self._current
+            if (
+                segment is None
+                or time.perf_counter() - segment.start < SAMPLE_INTERVAL
+                or len(segment.samples) >= MAX_SAMPLES
+                or (frame := sys._current_frames().get(self._loopThread)) is None
+            ):
+                continue
+            segment.samples.append(
+                tuple(
+                    traceback.format_list(traceback.extract_stack(frame, STACK_DEPTH))
+                )
+            )
+
+    def track(self, label: str, coro: Coroutine[Any, Any, _T]) -> Awaitable[_T]:
+        """Return an awaitable running a coroutine and timing its stretches."""
+        self.stats.setdefault(label, LabelStats()).calls += 1
+        return self._drive(label, coro)
+
+    @types.coroutine
+    def _drive(self, label: str, coro: Coroutine[Any, Any, _T]):
+        """Step through a coroutine, passing what it awaits on to the loop."""
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            previous = self._current
+            segment = self._current = Segment(label, time.perf_counter())
+            try:
+                yielded = coro.send(value) if error is None else coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._current = previous
+                self._record(segment)
+
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as err:  # noqa: BLE001
+                value, error = None, err
+
+    def _record(self, segment: Segment) -> None:
+        """Account for a finished stretch."""
+        segment.duration = time.perf_counter() - segment.start
+        stats = self.stats[segment.label]
+        stats.total += segment.duration
+        stats.worst = max(stats.worst, segment.duration)
+        if segment.duration < BLOCKING_THRESHOLD:
+            return
+
+        stats.blocking += 1
+        segment.at = dt_util.utcnow().isoformat()
+        stacks = segment.stacks(1)
+        _LOGGER.warning(
+            "%s blocked the event loop for %.3fs%s",
+            segment.label,
+            segment.duration,
+            ", most of the time in:\n" + "".join(stacks[0]["stack"]) if stacks else "",
+        )
+
+        entry = (segment.duration, next(self._sequence), segment)
+        if len(self._worst) < WORST_KEPT:
+            heapq.heappush(self._worst, entry)
+        else:
+            heapq.heappushpop(self._worst, entry)
+
+    @callback
+    def async_monitor_coordinator(self, coordinator: DataUpdateCoordinator) -> None:
+        """Monitor every refresh of a coordinator, listeners included."""
+        refresh = coordinator._async_refresh
+        label = f"{type(coordinator).__name__} refresh"
+
+        @wraps(refresh)
+        async def _async_refresh(*args: Any, **kwargs: Any) -> None:
+            await self.track(label, refresh(*args, **kwargs))
+
+        coordinator._async_refresh = _async_refresh
+
+    def report(self) -> dict[str, Any]:
+        """Return the worst offenders, for the diagnostics."""
+        return {
+            "threshold": BLOCKING_THRESHOLD,
+            "paths": {
+                label: {
+                    "calls": stats.calls,
+                    "blocking": stats.blocking,
+                    "total": round(stats.total, 4),
+                    "worst": round(stats.worst, 4),
+                }
+                for label, stats in sorted(
+                    self.stats.items(), key=lambda item: -item[1].worst
+                )
+            },
+            "worst": [
+                {
+                    "path": segment.label,
+                    "duration": round(duration, 4),
+                    "at": segment.at,
+                    "stacks": segment.stacks(),
+                }
+                for duration, _, segment in sorted(self._worst, reverse=True)
+            ],
+        }
+
+
+def monitored(
+    label: str,
+) -> Callable[
+    [Callable[..., Coroutine[Any, Any, _T]]], Callable[..., Coroutine[Any, Any, _T]]
+]:
+    """Monitor a coroutine function taking hass first, when debugging is on."""
+
+    def decorator(
+        func: Callable[..., Coroutine[Any, Any, _T]],
+    ) -> Callable[..., Coroutine[Any, Any, _T]]:
+        @wraps(func)
+        async def wrapper(hass: HomeAssistant, *args: Any, **kwargs: Any) -> _T:
+            monitor = hass.data.get(DOMAIN, {}).get(BLOCKING_MONITOR)
+            if monitor is None:
+                return await func(hass, *args, **kwargs)
+            return await monitor.track(label, func(hass, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
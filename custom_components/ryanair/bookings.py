@@ -0,0 +1,286 @@
+"""Ryanair booking helpers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+import re
+from typing import Any
+
+from homeassistant.util.json import JsonObjectType
+
+from .const import BOARDING_PASSES_URI
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Where boarding pass barcodes are rendered to. Read on every use, so the
+# tests can point it elsewhere.
+BOARDING_PASSES_DIR = Path(__file__).parent / BOARDING_PASSES_URI
+# Column order of the segment rows kept for each booking in the history.
+HISTORY_SEGMENT_FIELDS = (
+    "flightNumber",
+    "origin",
+    "destination",
+    "depart",
+    "arrive",
+    "isCancelled",
+)
+
+# The parts of an orders response the platforms read; everything else in
+# rawBooking is dropped as soon as the response is decoded.
+ORDERS_PROJECTION: dict[str, Any] = {
+    "items": {
+        "productId": None,
+        "rawBooking": {
+            "recordLocator": None,
+            "status": None,
+            "flights": {
+                "journeyNum": None,
+                "checkInOpenUTC": None,
+                "checkInCloseUTC": None,
+                "segments": {
+                    "segmentNum": None,
+                    "origin": None,
+                    "destination": None,
+                    "flightNumber": None,
+                    "isCancelled": None,
+                    "times": {"departUTC": None, "arriveUTC": None},
+                },
+            },
+            "seats": {
+                "journeyNum": None,
+                "segmentNum": None,
+                "paxNum": None,
+                "code": None,
+            },
+            "passengers": {
+                "paxNum": None,
+                "title": None,
+                "firstName": None,
+                "middleName": None,
+                "lastName": None,
+            },
+            "checkins": {"journeyNum": None, "paxNum": None, "status": None},
+        },
+    }
+}
+
+
+def project(data: Any, projection: dict[str, Any] | None) -> Any:
+    """Keep only the fields named in projection, recursing into lists."""
+    if projection is None:
+        return data
+    if isinstance(data, list):
+        return [project(value, projection) for value in data]
+    if isinstance(data, dict):
+        return {
+            key: project(data[key], fields)
+            for key, fields in projection.items()
+            if key in data
+        }
+    return data
+
+
+def projectOrders(body: Any) -> Any:
+    """Project an orders response, passing error responses through untouched."""
+    if isinstance(body, dict) and "items" in body:
+        return project(body, ORDERS_PROJECTION)
+    return body
+
+
+def parseUTC(value: str) -> datetime:
+    """Parse a UTC timestamp as returned by the Ryanair API."""
+    # fromisoformat() is many times faster than strptime(DATE_FORMAT).
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def nextDeparture(rawBooking: JsonObjectType) -> datetime | None:
+    """Return the earliest departure of a booking that has not happened yet."""
+    now = datetime.now(UTC)
+    departures = [
+        departure
+        for flight in rawBooking["flights"]
+        for segment in flight["segments"]
+        if (departure := parseUTC(segment["times"]["departUTC"])) > now
+    ]
+    return min(departures, default=None)
+
+
+def isFrozen(rawBooking: JsonObjectType) -> bool:
+    """Return True once every segment of a booking has landed or been cancelled."""
+    now = datetime.now(UTC)
+    segments = [
+        segment for flight in rawBooking["flights"] for segment in flight["segments"]
+    ]
+    return len(segments) > 0 and all(
+        segment["isCancelled"] or parseUTC(segment["times"]["arriveUTC"]) <= now
+        for segment in segments
+    )
+
+
+def checkedInPassengers(rawBooking: JsonObjectType) -> set[tuple[int, int]]:
+    """Return the (journeyNum, paxNum) of every passenger checked in."""
+    return {
+        (checkin["journeyNum"], checkin["paxNum"])
+        for checkin in rawBooking.get("checkins") or []
+        if checkin["status"] == "checkin"
+    }
+
+
+def parseItinerary(rawBooking: JsonObjectType) -> JsonObjectType:
+    """Normalise a raw booking into journeys, segments and passengers."""
+    passengers = {
+        passenger["paxNum"]: passenger for passenger in rawBooking["passengers"]
+    }
+    checkedIn = checkedInPassengers(rawBooking)
+
+    itinerary = {
+        "status": rawBooking["status"],
+        "bookingRef": rawBooking["recordLocator"],
+        "journeys": [],
+    }
+
+    for flight in rawBooking["flights"]:
+        journeyNum = flight["journeyNum"]
+        journey = {
+            "checkInOpen": flight["checkInOpenUTC"],
+            "checkInClose": flight["checkInCloseUTC"],
+            "checkInComplete": len(passengers) > 0
+            and all((journeyNum, paxNum) in checkedIn for paxNum in passengers),
+            "flights": [],
+        }
+
+        for segment in flight["segments"]:
+            segmentPassengers = []
+            for seat in rawBooking["seats"]:
+                if (
+                    seat["journeyNum"] != journeyNum
+                    or seat["segmentNum"] != segment["segmentNum"]
+                    or seat["paxNum"] not in passengers
+                ):
+                    continue
+
+                passenger = passengers[seat["paxNum"]]
+                segmentPassengers.append(
+                    {
+                        "seat": seat["code"],
+                        "title": passenger["title"],
+                        "firstName": passenger["firstName"],
+                        "middleName": passenger["middleName"],
+                        "lastName": passenger["lastName"],
+                        "checkedIn": (journeyNum, passenger["paxNum"]) in checkedIn,
+                    }
+                )
+
+            segmentInfo = {
+                "destination": segment["destination"],
+                "origin": segment["origin"],
+                "flightNumber": segment["flightNumber"],
+                "isCancelled": segment["isCancelled"],
+                "arrive": segment["times"]["arriveUTC"],
+                "depart": segment["times"]["departUTC"],
+                "checkInComplete": len(segmentPassengers) > 0
+                and all(passenger["checkedIn"] for passenger in segmentPassengers),
+                "passengers": segmentPassengers,
+            }
+            journey["flights"].insert(segment["segmentNum"], segmentInfo)
+
+        itinerary["journeys"].insert(journeyNum, journey)
+
+    return itinerary
+
+
+def parseItineraries(data: JsonObjectType | None) -> list[JsonObjectType]:
+    """Normalise every booking of an orders response."""
+    if data is None or "items" not in data:
+        return []
+
+    return [parseItinerary(item["rawBooking"]) for item in data["items"]]
+
+
+def compactBooking(rawBooking: JsonObjectType) -> JsonObjectType:
+    """Reduce a raw booking to what the travel history needs.
+
+    Segments are stored as rows in HISTORY_SEGMENT_FIELDS order rather than
+    as objects, which keeps years of bookings small on disk.
+    """
+    return {
+        "bookingRef": rawBooking["recordLocator"],
+        "status": rawBooking["status"],
+        "passengers": len(rawBooking["passengers"]),
+        "segments": [
+            [
+                segment["flightNumber"],
+                segment["origin"],
+                segment["destination"],
+                segment["times"]["departUTC"],
+                segment["times"]["arriveUTC"],
+                segment["isCancelled"],
+            ]
+            for flight in rawBooking["flights"]
+            for segment in flight["segments"]
+        ],
+    }
+
+
+def iterHistorySegments(
+    history: dict[str, JsonObjectType],
+) -> Iterator[tuple[str, JsonObjectType]]:
+    """Yield (bookingRef, segment) for every segment in the travel history."""
+    for booking in history.values():
+        for row in booking["segments"]:
+            yield (
+                booking["bookingRef"],
+                dict(zip(HISTORY_SEGMENT_FIELDS, row, strict=True)),
+            )
+
+
+def passengerName(boardingPass: JsonObjectType) -> str:
+    """Return the name of the passenger a boarding pass is for."""
+    return boardingPass["name"]["first"] + " " + boardingPass["name"]["last"]
+
+
+def boardingPassName(boardingPass: JsonObjectType) -> str:
+    """Return the display name of a boarding pass."""
+    flightName = (
+        "("
+        + boardingPass["flight"]["label"]
+        + ") "
+        + boardingPass["departure"]["name"]
+        + " - "
+        + boardingPass["arrival"]["name"]
+    )
+    seat = boardingPass["seat"]["designator"]
+    return passengerName(boardingPass) + ": " + flightName + "(" + seat + ")"
+
+
+def boardingPassFileName(boardingPass: JsonObjectType) -> str:
+    """Return the file name a boarding pass is rendered to."""
+    return (
+        re.sub(
+            r"[\W_]",
+            "",
+            boardingPassName(boardingPass) + boardingPass["departure"]["dateUTC"],
+        )
+        + ".png"
+    )
+
+
+def iterSegments(
+    itineraries: list[JsonObjectType],
+) -> Iterator[tuple[str, JsonObjectType, JsonObjectType]]:
+    """Yield (bookingRef, checkInInfo, segment) for every segment."""
+    for itinerary in itineraries:
+        for journey in itinerary["journeys"]:
+            checkInInfo = {
+                "checkInOpen": journey["checkInOpen"],
+                "checkInClose": journey["checkInClose"],
+            }
+            for segment in journey["flights"]:
+                yield itinerary["bookingRef"], checkInInfo, segment
+
+
+def boardingPassPath(boardingPass: JsonObjectType) -> Path:
+    """Return the path a boarding pass is rendered to."""
+    return BOARDING_PASSES_DIR / boardingPassFileName(boardingPass)
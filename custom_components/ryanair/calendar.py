@@ -0,0 +1,302 @@
+"""Ryanair flights calendar."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Any
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .airports import AirportTable, async_get_airports
+from .blocking import monitored
+from .bookings import HISTORY_SEGMENT_FIELDS, compactBooking, parseUTC
+from .const import (
+    BOOKING_STORE,
+    CONF_CALENDAR_CHECK_IN,
+    COORDINATORS,
+    CUSTOMER_ID,
+    CUSTOMERS,
+    DOMAIN,
+    FLIGHTS_COORDINATOR,
+    PRODUCT_ID,
+    PROFILE_COORDINATOR,
+)
+from .coordinator import RyanairFlightsCoordinator
+from .sensor import deviceInfo, generate_device_fingerprint, getProfileName
+
+
+@dataclass(slots=True)
+class FlightEvent:
+    """A calendar entry, turned into a CalendarEvent only when it is shown.
+
+    CalendarEvent validates itself on creation, which is too slow to do for
+    years of flights up front.
+    """
+
+    start: datetime
+    end: datetime
+    summary: str
+    description: str | None = None
+    location: str | None = None
+    uid: str | None = None
+    _calendarEvent: CalendarEvent | None = field(default=None, repr=False)
+
+    @property
+    def calendarEvent(self) -> CalendarEvent:
+        """Return the entry as a CalendarEvent."""
+        if self._calendarEvent is None:
+            self._calendarEvent = CalendarEvent(
+                start=self.start,
+                end=self.end,
+                summary=self.summary,
+                description=self.description,
+                location=self.location,
+                uid=self.uid,
+            )
+        return self._calendarEvent
+
+
+class IntervalIndex:
+    """Calendar events sorted by start time.
+
+    Events that overlap a window are found by bisecting to the first event
+    that could still be running at its start, which is at most the longest
+    event's duration before it, and reading forward to its end.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._entries: list[tuple[datetime, int, FlightEvent]] = []
+        self._sequence = count()
+        self._maxDuration = timedelta(0)
+
+    def __len__(self) -> int:
+        """Return the number of events."""
+        return len(self._entries)
+
+    def add(self, event: FlightEvent) -> tuple[datetime, int, FlightEvent]:
+        """Add an event and return its entry, used to remove it again."""
+        entry = (event.start, next(self._sequence), event)
+        insort(self._entries, entry, key=lambda item: item[:2])
+        self._maxDuration = max(self._maxDuration, event.end - event.start)
+        return entry
+
+    def remove(self, entry: tuple[datetime, int, FlightEvent]) -> None:
+        """Remove an event."""
+        index = bisect_left(self._entries, entry[:2], key=lambda item: item[:2])
+        if index < len(self._entries) and self._entries[index][1] == entry[1]:
+            del self._entries[index]
+
+    def _first(self, start: datetime) -> int:
+        """Return the index of the first event that may end after start."""
+        return bisect_left(
+            self._entries, start - self._maxDuration, key=lambda item: item[0]
+        )
+
+    def overlapping(self, start: datetime, end: datetime) -> list[FlightEvent]:
+        """Return the events overlapping a window, in start order."""
+        events = []
+        for index in range(self._first(start), len(self._entries)):
+            eventStart, _, event = self._entries[index]
+            if eventStart >= end:
+                break
+            if event.end > start:
+                events.append(event)
+        return events
+
+    def next(self, now: datetime) -> FlightEvent | None:
+        """Return the event in progress, or else the next one to start."""
+        for index in range(self._first(now), len(self._entries)):
+            event = self._entries[index][2]
+            if event.end > now:
+                return event
+        return None
+
+
+def segmentEvents(
+    bookingRef: str, segments: list[list[Any]], airports: AirportTable
+) -> list[FlightEvent]:
+    """Return an event for every segment of a booking."""
+    events: list[FlightEvent] = []
+    for row in segments:
+        segment = dict(zip(HISTORY_SEGMENT_FIELDS, row, strict=True))
+        origin = airports.get(segment["origin"])
+        destination = airports.get(segment["destination"])
+        events.append(
+            FlightEvent(
+                start=parseUTC(segment["depart"]),
+                end=parseUTC(segment["arrive"]),
+                summary=(
+                    ("Cancelled: " if segment["isCancelled"] else "")
+                    + f"{segment['flightNumber']} {segment['origin']}"
+                    + f" - {segment['destination']}"
+                ),
+                description=(
+                    f"Booking {bookingRef}"
+                    + (f"\nTo {destination.name}" if destination else "")
+                ),
+                location=origin.name if origin else segment["origin"],
+                uid=f"{bookingRef}-{segment['flightNumber']}-{segment['depart']}",
+            )
+        )
+    return events
+
+
+def checkInEvents(rawBooking: dict[str, Any]) -> list[FlightEvent]:
+    """Return an event for the check-in window of every journey."""
+    return [
+        FlightEvent(
+            start=parseUTC(flight["checkInOpenUTC"]),
+            end=parseUTC(flight["checkInCloseUTC"]),
+            summary=(
+                "Check-in "
+                + " / ".join(segment["flightNumber"] for segment in flight["segments"])
+            ),
+            description=f"Booking {rawBooking['recordLocator']}",
+            uid=f"{rawBooking['recordLocator']}-checkin-{flight['journeyNum']}",
+        )
+        for flight in rawBooking["flights"]
+    ]
+
+
+@monitored("calendar setup")
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the calendar from a config entry created in the integrations UI."""
+    config = hass.data[DOMAIN][entry.entry_id]
+    deviceFingerprint = generate_device_fingerprint(config[CONF_EMAIL])
+    coordinators = hass.data[DOMAIN][COORDINATORS][deviceFingerprint]
+
+    async_add_entities(
+        [
+            RyanairCalendar(
+                coordinators[FLIGHTS_COORDINATOR],
+                coordinators[BOOKING_STORE],
+                await async_get_airports(hass),
+                getProfileName(coordinators[PROFILE_COORDINATOR]),
+                config[CUSTOMERS][deviceFingerprint][CUSTOMER_ID],
+                entry.options.get(CONF_CALENDAR_CHECK_IN, False),
+            )
+        ]
+    )
+
+
+class RyanairCalendar(CoordinatorEntity[RyanairFlightsCoordinator], CalendarEntity):
+    """Every flight of an account, past and upcoming."""
+
+    _attr_icon = "mdi:airplane"
+
+    def __init__(
+        self,
+        coordinator: RyanairFlightsCoordinator,
+        store,
+        airports: AirportTable,
+        name: str,
+        customerId: str,
+        checkIn: bool,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.store = store
+        self.airports = airports
+        self.checkIn = checkIn
+        self._attr_name = "Flights"
+        self._attr_device_info = deviceInfo(name)
+        self._attr_unique_id = f"{DOMAIN}-{customerId}-calendar".lower()
+
+        self.index = IntervalIndex()
+        # productId -> (booking the events were built from, their index entries)
+        self._bookings: dict[str, tuple[Any, list]] = {}
+        self._async_update_index()
+
+    @callback
+    def _async_update_index(self) -> None:
+        """Re-index the bookings that have changed since the last update.
+
+        Frozen and historic bookings are the same objects from one update to
+        the next, so they are skipped after an identity check.
+        """
+        seen = set()
+        data = self.coordinator.data
+        for item in (data or {}).get("items", []) if isinstance(data, dict) else []:
+            seen.add(item[PRODUCT_ID])
+            self._async_index_booking(item[PRODUCT_ID], item, True)
+
+        # Frozen bookings the orders response no longer lists are orders
+        # items all the same.
+        for productId, item in self.store.bookings.items():
+            if productId not in seen:
+                seen.add(productId)
+                self._async_index_booking(productId, item, True)
+
+        for productId, booking in self.store.history.items():
+            if productId not in seen:
+                seen.add(productId)
+                self._async_index_booking(productId, booking, False)
+
+        for productId in self._bookings.keys() - seen:
+            for entry in self._bookings.pop(productId)[1]:
+                self.index.remove(entry)
+
+    @callback
+    def _async_index_booking(self, productId: str, booking: Any, active: bool) -> None:
+        """Index the events of a booking, replacing those of an older version."""
+        previous = self._bookings.get(productId)
+        if previous is not None and (previous[0] is booking or previous[0] == booking):
+            return
+
+        if previous is not None:
+            for entry in previous[1]:
+                self.index.remove(entry)
+
+        if active:
+            rawBooking = booking["rawBooking"]
+            events = segmentEvents(
+                rawBooking["recordLocator"],
+                compactBooking(rawBooking)["segments"],
+                self.airports,
+            )
+            if self.checkIn:
+                events.extend(checkInEvents(rawBooking))
+        else:
+            events = segmentEvents(
+                booking["bookingRef"], booking["segments"], self.airports
+            )
+
+        self._bookings[productId] = (
+            booking,
+            [self.index.add(event) for event in events],
+        )
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next upcoming event."""
+        event = self.index.next(dt_util.now())
+        return None if event is None else event.calendarEvent
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return calendar events within a datetime range."""
+        return [
+            event.calendarEvent
+            for event in self.index.overlapping(start_date, end_date)
+        ]
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._async_update_index()
+        super()._handle_coordinator_update()
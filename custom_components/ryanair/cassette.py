@@ -0,0 +1,150 @@
+"""Record and replay Ryanair API traffic."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+import hashlib
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Any
+from urllib.parse import urlsplit
+
+from aiohttp import ClientError
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import save_json
+from homeassistant.util.json import load_json
+
+_LOGGER = logging.getLogger(__name__)
+
+CASSETTE_RECORD = "record"
+CASSETTE_REPLAY = "replay"
+CASSETTE_MODES = [CASSETTE_RECORD, CASSETTE_REPLAY]
+
+REDACTED = "REDACTED"
+# Credentials, account identifiers and barcodes are replaced outright.
+SECRET_KEYS = {
+    "token",
+    "customerId",
+    "surrogateId",
+    "authToken",
+    "password",
+    "mfaToken",
+    "mfaCode",
+    "barcode",
+    "X-AUTH-TOKEN",
+    "X-REMEMBERME-TOKEN",
+}
+# Personal details are replaced with a stable pseudonym, so that values that
+# matched in the recording (e.g. the contact email sent back to the boarding
+# pass endpoint) still match on replay.
+PERSONAL_KEYS = {
+    "email",
+    "Email",
+    "firstName",
+    "middleName",
+    "lastName",
+    "first",
+    "last",
+    "phoneNumber",
+    "dateOfBirth",
+    "googlePictureUrl",
+}
+ID_SEGMENT = re.compile(r"(/(?:accounts|customers|orders/v2/orders))/[^/?]+(?=/)")
+
+
+def pseudonym(value: Any) -> Any:
+    """Return a stable stand-in for a personal value."""
+    if not isinstance(value, str) or not value or value.startswith("redacted-"):
+        return value
+    return "redacted-" + hashlib.sha256(value.encode("UTF-8")).hexdigest()[:12]
+
+
+def redact(data: Any) -> Any:
+    """Return a copy of data with credentials and personal details removed."""
+    if isinstance(data, dict):
+        redacted = {}
+        for key, value in data.items():
+            if key in SECRET_KEYS and isinstance(value, str):
+                redacted[key] = REDACTED
+            elif key in PERSONAL_KEYS:
+                redacted[key] = pseudonym(value)
+            else:
+                redacted[key] = redact(value)
+        return redacted
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+
+def interactionKey(method: str, url: str, body: Any) -> str:
+    """Return the key identifying a request, independent of account and host."""
+    parts = urlsplit(url)
+    path = ID_SEGMENT.sub(r"\1/{id}", parts.path)
+    query = "?" + parts.query if parts.query else ""
+    payload = json.dumps(redact(body), sort_keys=True) if body is not None else ""
+    return f"{method.upper()} {path}{query} {payload}".rstrip()
+
+
+class Cassette:
+    """Request/response pairs captured from, or played back to, the client."""
+
+    def __init__(self, hass: HomeAssistant, path: Path, mode: str) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.path = path
+        self.mode = mode
+        self.interactions: list[dict[str, Any]] = []
+        self._playback: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._position: dict[str, int] = defaultdict(int)
+
+    @property
+    def replaying(self) -> bool:
+        """Return True if responses are served from the cassette."""
+        return self.mode == CASSETTE_REPLAY
+
+    async def async_load(self) -> None:
+        """Load recorded interactions from disk."""
+        data = await self.hass.async_add_executor_job(load_json, self.path, [])
+        self.interactions = data if isinstance(data, list) else []
+
+        self._playback.clear()
+        self._position.clear()
+        for interaction in self.interactions:
+            self._playback[interaction["key"]].append(interaction)
+
+        _LOGGER.debug(
+            "Loaded %s interactions from %s", len(self.interactions), self.path
+        )
+
+    async def async_record(
+        self, method: str, url: str, body: Any, status: int, response: Any
+    ) -> None:
+        """Append a redacted interaction and write the cassette."""
+        self.interactions.append(
+            {
+                "key": interactionKey(method, url, body),
+                "status": status,
+                "response": redact(response),
+            }
+        )
+        await self.hass.async_add_executor_job(
+            save_json, str(self.path), self.interactions
+        )
+
+    def play(self, method: str, url: str, body: Any) -> tuple[int, Any]:
+        """Return the next recorded response for a request.
+
+        Responses recorded for the same request are served in order, and the
+        last one is repeated once they run out, so replays are deterministic.
+        """
+        key = interactionKey(method, url, body)
+        recorded = self._playback.get(key)
+        if not recorded:
+            raise ClientError(f"No recorded response for {key}")
+
+        position = self._position[key]
+        self._position[key] = min(position + 1, len(recorded) - 1)
+        return recorded[position]["status"], recorded[position]["response"]
@@ -0,0 +1,156 @@
+"""Actions at the opening of Ryanair check-in windows."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonObjectType
+
+from .bookings import parseUTC
+from .const import (
+    ATTR_BOOKING_REFERENCE,
+    BOARDING_PASS_URL,
+    BOOKING_DETAILS_URL,
+    DOMAIN,
+    EVENT_CHECK_IN_OPEN,
+    FLIGHTS_COORDINATOR,
+    PROFILE_COORDINATOR,
+)
+from .coordinator import ORDERS_URL
+from .services import async_refresh_booking
+
+_LOGGER = logging.getLogger(__name__)
+
+# Connections are opened and the token checked this long before a window
+# opens, well within the time the session keeps idle connections alive.
+CHECK_IN_WARM_UP = timedelta(seconds=5)
+WARM_UP_URLS = (ORDERS_URL, BOOKING_DETAILS_URL, BOARDING_PASS_URL)
+
+
+class RyanairCheckInScheduler:
+    """Fires an event as the check-in window of each journey opens.
+
+    With refresh enabled, the booking is refreshed at that instant too. A
+    few seconds before, the account's token is validated and connections to
+    the API are opened, so neither the refresh nor an automation reacting to
+    the event waits on re-authentication or handshakes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinators: dict[str, Any],
+        client,
+        refresh: bool,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.coordinators = coordinators
+        self.client = client
+        self.refresh = refresh
+        # (recordLocator, journeyNum) -> (opening, callbacks cancelling its timers)
+        self._timers: dict[tuple[str, int], tuple[datetime, list[CALLBACK_TYPE]]] = {}
+
+    @callback
+    def async_schedule(self) -> None:
+        """Schedule the check-in windows still to open, as of the latest flights."""
+        now = dt_util.utcnow()
+        data = self.coordinators[FLIGHTS_COORDINATOR].data
+        openings: dict[tuple[str, int], tuple[datetime, JsonObjectType]] = {}
+        for item in data.get("items", []) if isinstance(data, dict) else []:
+            rawBooking = item["rawBooking"]
+            for flight in rawBooking["flights"]:
+                opening = parseUTC(flight["checkInOpenUTC"])
+                if opening > now:
+                    key = (rawBooking["recordLocator"], flight["journeyNum"])
+                    openings[key] = (opening, flight)
+
+        for key in self._timers.keys() - openings.keys():
+            self._async_cancel(key)
+
+        for key, (opening, flight) in openings.items():
+            if key in self._timers and self._timers[key][0] == opening:
+                continue
+            self._async_cancel(key)
+
+            unsubs = [
+                async_track_point_in_utc_time(
+                    self.hass,
+                    HassJob(
+                        partial(self._async_open, key, flight),
+                        f"{DOMAIN} check-in open {key[0]}",
+                        cancel_on_shutdown=True,
+                    ),
+                    opening,
+                )
+            ]
+            if opening - CHECK_IN_WARM_UP > now:
+                unsubs.append(
+                    async_track_point_in_utc_time(
+                        self.hass,
+                        HassJob(
+                            self._async_warm_up,
+                            f"{DOMAIN} check-in warm up {key[0]}",
+                            cancel_on_shutdown=True,
+                        ),
+                        opening - CHECK_IN_WARM_UP,
+                    )
+                )
+            self._timers[key] = (opening, unsubs)
+
+    @callback
+    def _async_cancel(self, key: tuple[str, int]) -> None:
+        """Cancel the timers of a check-in window."""
+        if (timers := self._timers.pop(key, None)) is not None:
+            for unsub in timers[1]:
+                unsub()
+
+    @callback
+    def async_cancel_all(self) -> None:
+        """Cancel every timer."""
+        for key in list(self._timers):
+            self._async_cancel(key)
+
+    async def _async_warm_up(self, _now: datetime) -> None:
+        """Open connections to the API and validate the token."""
+        _LOGGER.debug("Warming up for a check-in window opening")
+        # The profile refresh re-authenticates if the token has expired.
+        await asyncio.gather(
+            self.client.async_warm_up(WARM_UP_URLS),
+            self.coordinators[PROFILE_COORDINATOR].async_refresh(),
+        )
+
+    async def _async_open(
+        self, key: tuple[str, int], flight: JsonObjectType, _now: datetime
+    ) -> None:
+        """Announce the opening of a check-in window."""
+        self._timers.pop(key, None)
+        bookingRef, journeyNum = key
+        self.hass.bus.async_fire(
+            EVENT_CHECK_IN_OPEN,
+            {
+                "entry_id": self.entry.entry_id,
+                ATTR_BOOKING_REFERENCE: bookingRef,
+                "journey_num": journeyNum,
+                "flights": [segment["flightNumber"] for segment in flight["segments"]],
+                "check_in_open": flight["checkInOpenUTC"],
+                "check_in_close": flight["checkInCloseUTC"],
+            },
+        )
+
+        if self.refresh:
+            try:
+                await async_refresh_booking(self.coordinators, bookingRef)
+            except HomeAssistantError as err:
+                _LOGGER.warning("Could not refresh %s at check-in: %s", bookingRef, err)
@@ -0,0 +1,276 @@
+"""Ryanair API client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from http import HTTPStatus
+import logging
+from typing import Any
+from urllib.parse import urlsplit
+
+from aiohttp import ClientError, ClientSession
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
+
+from .cassette import Cassette
+from .const import (
+    CASSETTE,
+    CLIENTS,
+    CONF_BASE_URL,
+    DOMAIN,
+    MAX_ACCOUNT_REQUESTS,
+    PRIORITY_AGING,
+    PRIORITY_MEDIUM,
+)
+from .errors import APIRatelimitExceeded
+from .scheduler import async_get_scheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class _Waiter:
+    """A request waiting for a slot."""
+
+    priority: int
+    enqueued: float
+    future: asyncio.Future[None]
+
+
+class RequestQueue:
+    """Bounded, priority ordered access to the API for one account.
+
+    The waiting request with the lowest priority value goes first. Every
+    PRIORITY_AGING seconds spent waiting lowers that value by one, so
+    background requests are delayed but never starved.
+    """
+
+    def __init__(self, maxConcurrent: int = MAX_ACCOUNT_REQUESTS) -> None:
+        """Initialize."""
+        self.maxConcurrent = maxConcurrent
+        self._active = 0
+        self._waiters: list[_Waiter] = []
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Hold one of the account's request slots."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait for a free slot."""
+        if self._active < self.maxConcurrent and not self._waiters:
+            self._active += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, loop.time(), loop.create_future())
+        self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.future.cancelled():
+                # The slot was handed over as the caller was cancelled.
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Free a slot and hand it to the most urgent waiter."""
+        self._active -= 1
+
+        while self._waiters and self._active < self.maxConcurrent:
+            now = asyncio.get_running_loop().time()
+            waiter = min(
+                self._waiters,
+                key=lambda w: (
+                    w.priority - (now - w.enqueued) / PRIORITY_AGING,
+                    w.enqueued,
+                ),
+            )
+            self._waiters.remove(waiter)
+            if waiter.future.done():
+                continue
+
+            self._active += 1
+            waiter.future.set_result(None)
+
+
+@dataclass(eq=False)
+class _SharedRequest:
+    """A request in flight and the number of callers waiting for it."""
+
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+def _requestKey(
+    method: str, url: str, headers: dict[str, str] | None, json: Any
+) -> tuple:
+    """Return what makes two requests identical."""
+    return (
+        method,
+        url,
+        tuple(sorted((headers or {}).items())),
+        None if json is None else json_bytes(json),
+    )
+
+
+class RyanairClient:
+    """Send requests to the Ryanair API on behalf of one account."""
+
+    def __init__(
+        self,
+        session: ClientSession,
+        baseUrl: str | None = None,
+        cassette: Cassette | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> None:
+        """Initialize."""
+        self.session = session
+        self.baseUrl = baseUrl.rstrip("/") if baseUrl else None
+        self.cassette = cassette
+        self.semaphore = semaphore
+        self.queue = RequestQueue()
+        # Requests in flight that identical requests can share, by _requestKey.
+        self._inFlight: dict[tuple, _SharedRequest] = {}
+
+    def url(self, url: str) -> str:
+        """Return the URL to call, rebased onto the base URL if one is set."""
+        if self.baseUrl is None:
+            return url
+
+        parts = urlsplit(url)
+        query = "?" + parts.query if parts.query else ""
+        return self.baseUrl + parts.path + query
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        json: Any = None,
+        priority: int = PRIORITY_MEDIUM,
+        coalesce: bool | None = None,
+    ) -> Any:
+        """Send a request and return the decoded JSON body.
+
+        Reads, which are GETs unless coalesce says otherwise, share the
+        response of an identical request already in flight, that is one with
+        the same method, URL, headers, and so credentials, and body. The body
+        returned is then shared too, so it must not be modified in place.
+        """
+        if not (method == "GET" if coalesce is None else coalesce):
+            return await self._request(method, url, headers, json, priority)
+
+        key = _requestKey(method, url, headers, json)
+        if (shared := self._inFlight.get(key)) is None:
+            shared = self._inFlight[key] = _SharedRequest(
+                asyncio.create_task(
+                    self._request(method, url, headers, json, priority),
+                    name=f"ryanair {method} {url}",
+                )
+            )
+
+            def _forget(_task: asyncio.Task[Any]) -> None:
+                if self._inFlight.get(key) is shared:
+                    del self._inFlight[key]
+
+            shared.task.add_done_callback(_forget)
+
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            # Only give up on the request once nobody is waiting for it.
+            if shared.waiters == 1:
+                shared.task.cancel()
+            raise
+        finally:
+            shared.waiters -= 1
+
+    async def async_warm_up(self, urls: Iterable[str]) -> None:
+        """Open a connection to the host of every URL ahead of using it.
+
+        A HEAD request leaves a kept-alive connection in the session's pool,
+        so the next request to the host skips the TCP and TLS handshakes.
+        """
+        if self.cassette is not None and self.cassette.replaying:
+            return
+
+        origins = set()
+        for url in urls:
+            parts = urlsplit(self.url(url))
+            origins.add(f"{parts.scheme}://{parts.netloc}/")
+
+        async def _head(origin: str) -> None:
+            try:
+                async with self.session.head(origin) as resp:
+                    await resp.read()
+            except (ClientError, TimeoutError) as err:
+                _LOGGER.debug("Could not warm up %s: %s", origin, err)
+
+        await asyncio.gather(*(_head(origin) for origin in origins))
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None,
+        json: Any,
+        priority: int,
+    ) -> Any:
+        """Send a request and return the decoded JSON body."""
+        if self.cassette is not None and self.cassette.replaying:
+            status, body = self.cassette.play(method, url, json)
+        else:
+            async with self.queue.slot(priority), self.semaphore or nullcontext():
+                resp = await self.session.request(
+                    method=method, url=self.url(url), headers=headers, json=json
+                )
+                status = resp.status
+
+                if status == HTTPStatus.TOO_MANY_REQUESTS:
+                    resp.release()
+                    body = None
+                else:
+                    # Read the body once and decode it with orjson.
+                    try:
+                        body = json_loads(await resp.read())
+                    except ValueError as err:
+                        raise ClientError(f"Invalid JSON response: {err}") from err
+
+            if self.cassette is not None:
+                await self.cassette.async_record(method, url, json, status, body)
+
+        if status == HTTPStatus.TOO_MANY_REQUESTS:
+            raise APIRatelimitExceeded("API rate limit exceeded.")
+
+        return body
+
+
+@callback
+def async_get_client(hass: HomeAssistant, fingerprint: str) -> RyanairClient:
+    """Return the client shared by every coordinator of an account."""
+    domainData = hass.data.setdefault(DOMAIN, {})
+    clients = domainData.setdefault(CLIENTS, {})
+
+    if fingerprint not in clients:
+        clients[fingerprint] = RyanairClient(
+            async_get_clientsession(hass),
+            domainData.get(CONF_BASE_URL),
+            domainData.get(CASSETTE),
+            async_get_scheduler(hass).semaphore,
+        )
+
+    return clients[fingerprint]
@@ -8,18 +8,32 @@ import uuid
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .client import RyanairClient
 from .const import (
+    CASSETTE,
     CODE_MFA_CODE_WRONG,
     CODE_PASSWORD_WRONG,
     CODE_UNKNOWN_DEVICE,
+    CONF_AGGREGATE_BOOKINGS,
+    CONF_ARCHIVE_DAYS,
+    CONF_BASE_URL,
+    CONF_CALENDAR_CHECK_IN,
+    CONF_CHECK_IN_REFRESH,
     CONF_DEVICE_FINGERPRINT,
+    CONF_HISTORY,
     CUSTOMER_ID,
     CUSTOMERS,
+    DEFAULT_ARCHIVE_DAYS,
     DOMAIN,
     MFA_CODE,
     MFA_TOKEN,
@@ -51,8 +65,13 @@ async def validate_input(
     hass: HomeAssistant, data: dict[str, Any], fingerprint: str
 ) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
-    session = async_get_clientsession(hass)
-    coordinator = RyanairCoordinator(hass, session, data, fingerprint)
+    domainData = hass.data.get(DOMAIN, {})
+    client = RyanairClient(
+        async_get_clientsession(hass),
+        domainData.get(CONF_BASE_URL),
+        domainData.get(CASSETTE),
+    )
+    coordinator = RyanairCoordinator(hass, client, data, fingerprint)
 
     await coordinator.async_refresh()
 
@@ -91,8 +110,13 @@ async def validate_mfa_input(
 ) -> dict[str, Any]:
     """Validate the MFA input allows us to connect."""
 
-    session = async_get_clientsession(hass)
-    coordinator = RyanairMfaCoordinator(hass, session, data)
+    domainData = hass.data.get(DOMAIN, {})
+    client = RyanairClient(
+        async_get_clientsession(hass),
+        domainData.get(CONF_BASE_URL),
+        domainData.get(CASSETTE),
+    )
+    coordinator = RyanairMfaCoordinator(hass, client, data)
 
     await coordinator.async_refresh()
 
@@ -130,6 +154,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         """Init."""
         self._fingerprint: str | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return OptionsFlowHandler(config_entry)
+
     async def async_step_mfa(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -297,3 +327,48 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
             description_placeholders={"retries": placeholder},
             errors=errors,
         )
+
+
+class OptionsFlowHandler(OptionsFlow):
+    """Handle Ryanair options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Init."""
+        self.entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_HISTORY,
+                        default=self.entry.options.get(CONF_HISTORY, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_CALENDAR_CHECK_IN,
+                        default=self.entry.options.get(CONF_CALENDAR_CHECK_IN, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_AGGREGATE_BOOKINGS,
+                        default=self.entry.options.get(CONF_AGGREGATE_BOOKINGS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ARCHIVE_DAYS,
+                        default=self.entry.options.get(
+                            CONF_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=365)),
+                    vol.Optional(
+                        CONF_CHECK_IN_REFRESH,
+                        default=self.entry.options.get(CONF_CHECK_IN_REFRESH, False),
+                    ): bool,
+                }
+            ),
+        )
@@ -19,6 +19,7 @@ USER_PROFILE = "usrprof/"
 ORDERS = "orders/"
 V = "v2/"
 DETAILS = "details?type=flight&active=true"
+HISTORY = "details?type=flight&active=false"
 ACCOUNT_LOGIN = "accountLogin"
 DEVICE_VERIFICATION = "deviceFingerprint"
 ACCOUNT_VERIFICATION = "accountVerifications"
@@ -53,3 +54,38 @@ BOOKING_ID = "bookingId"
 SURROGATE_ID = "surrogateId"
 CLIENT_VERSION = "client-version"
 CLIENT = "client"
+CLIENTS = "clients"
+CONF_BASE_URL = "base_url"
+CASSETTE = "cassette"
+CONF_CASSETTE = "cassette"
+CONF_CASSETTE_MODE = "cassette_mode"
+SCHEDULER = "scheduler"
+MAX_CONCURRENT_REQUESTS = 4
+MAX_ACCOUNT_REQUESTS = 2
+PRIORITY_HIGH = 0
+PRIORITY_MEDIUM = 1
+PRIORITY_LOW = 2
+PRIORITY_AGING = 30
+COORDINATORS = "coordinators"
+PROFILE_COORDINATOR = "profile_coordinator"
+FLIGHTS_COORDINATOR = "flights_coordinator"
+BOOKING_DETAILS_COORDINATOR = "booking_details_coordinator"
+BOARDING_PASS_COORDINATOR = "boarding_pass_coordinator"
+BOOKING_STORE = "booking_store"
+CONF_HISTORY = "history"
+HISTORY_COORDINATOR = "history_coordinator"
+AIRPORTS = "airports"
+CONF_CALENDAR_CHECK_IN = "calendar_check_in"
+CONF_AGGREGATE_BOOKINGS = "aggregate_bookings"
+SELECTED_PASSENGERS = "selected_passengers"
+SIGNAL_PASSENGER_SELECTED = f"{DOMAIN}_passenger_selected_{{}}"
+CONF_ARCHIVE_DAYS = "archive_days"
+DEFAULT_ARCHIVE_DAYS = 2
+ARCHIVER = "archiver"
+SERVICE_REFRESH_BOOKING = "refresh_booking"
+ATTR_BOOKING_REFERENCE = "booking_reference"
+CONF_CHECK_IN_REFRESH = "check_in_refresh"
+EVENT_CHECK_IN_OPEN = f"{DOMAIN}_checkin_open"
+CONF_DEBUG_BLOCKING = "debug_blocking"
+BLOCKING_MONITOR = "blocking_monitor"
+SIGNAL_ACCOUNTS_CHANGED = f"{DOMAIN}_accounts_changed"
@@ -1,19 +1,29 @@
 """Ryanair Coordinator."""
 
-from datetime import timedelta
+from abc import ABC, abstractmethod
+import asyncio
+import copy
+from datetime import datetime, timedelta
 import logging
 from pathlib import Path
-import re
 
-from aiohttp import ClientError, ClientSession
+from aiohttp import ClientConnectionError, ClientError
 from aztec_code_generator import AztecCode
 
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, CONTENT_TYPE_JSON
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import JsonObjectType, load_json_object
 
+from .bookings import (
+    boardingPassPath,
+    checkedInPassengers,
+    nextDeparture,
+    parseUTC,
+    projectOrders,
+)
 from .const import (
     ACCESS_DENIED,
     ACCOUNT_LOGIN,
@@ -21,10 +31,9 @@ from .const import (
     ACCOUNTS,
     AUTH_TOKEN,
     BOARDING_PASS_URL,
-    BOARDING_PASSES_URI,
     BOOKING_DETAILS_URL,
+    BOOKING_ID,
     BOOKING_INFO,
-    BOOKING_REFERENCE,
     CAUSE,
     CLIENT_ERROR,
     CLIENT_VERSION,
@@ -37,15 +46,21 @@ from .const import (
     DEVICE_VERIFICATION,
     DOMAIN,
     EMAIL,
+    HISTORY,
     HOST,
     MFA_CODE,
     MFA_TOKEN,
     NOT_AUTHENTICATED,
     ORDERS,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_MEDIUM,
+    PRODUCT_ID,
     PROFILE,
     RECORD_LOCATOR,
     REMEMBER_ME,
     REMEMBER_ME_TOKEN,
+    SURROGATE_ID,
     TOKEN,
     TYPE,
     USER_PROFILE,
@@ -58,6 +73,19 @@ _LOGGER = logging.getLogger(__name__)
 
 USER_PROFILE_URL = HOST + USER_PROFILE + V
 ORDERS_URL = HOST + ORDERS + V
+# Booking details for flights departing sooner than this jump the queue.
+IMMINENT_DEPARTURE = timedelta(hours=48)
+# Boarding passes are kept until a day after departure and only re-fetched
+# this often, unless a passenger of the booking has just checked in.
+PASS_PIN_AFTER_DEPARTURE = timedelta(days=1)
+PASS_REVALIDATE_INTERVAL = timedelta(hours=6)
+# While the API is unreachable it is retried after this long, doubling on every
+# failure up to the maximum.
+OFFLINE_RETRY_MIN = timedelta(minutes=1)
+OFFLINE_RETRY_MAX = timedelta(minutes=30)
+# Past orders are synced again this often, picking up the bookings completed
+# since, e.g. while Home Assistant was not running.
+HISTORY_RESYNC_INTERVAL = timedelta(days=1)
 
 
 async def async_load_json_object(hass: HomeAssistant, path: Path) -> JsonObjectType:
@@ -65,117 +93,134 @@ async def async_load_json_object(hass: HomeAssistant, path: Path) -> JsonObjectT
     return await hass.async_add_executor_job(load_json_object, path)
 
 
+def updateEntries(self, userData):
+    """Persist refreshed credentials to the config entry of this account.
+
+    The entry gets its own copy of the nested credentials. Sharing them would
+    let the next refresh change the entry's data in place, which then compares
+    equal to the update and is never saved.
+    """
+    for entry in self.hass.config_entries.async_entries(DOMAIN):
+        if entry.data.get(CONF_EMAIL) != userData.get(CONF_EMAIL):
+            continue
+
+        updated_data = copy.deepcopy(dict(entry.data))
+        updated_data.update(copy.deepcopy(userData))
+        self.hass.config_entries.async_update_entry(entry, data=updated_data)
+
+    return userData
+
+
 async def rememberMeToken(self, userData, fingerprint):
     """Remember me token."""
-    async with ClientSession() as session:
-        if CUSTOMERS in userData and fingerprint in userData[CUSTOMERS]:
-            data = userData[CUSTOMERS][fingerprint]
-        else:
-            data = userData
+    if CUSTOMERS in userData and fingerprint in userData[CUSTOMERS]:
+        data = userData[CUSTOMERS][fingerprint]
+    else:
+        data = userData
 
-        rememberMeTokenResp = await session.request(
-            method="GET",
-            url=USER_PROFILE_URL
-            + ACCOUNTS
-            + "/"
-            + data[CUSTOMER_ID]
-            + "/"
-            + REMEMBER_ME_TOKEN,
-            headers={
-                CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
-                CONF_AUTH_TOKEN: data[TOKEN],
-            },
-        )
-        rememberMeTokenResponse = await rememberMeTokenResp.json()
+    rememberMeTokenResponse = await self.client.request(
+        method="GET",
+        url=USER_PROFILE_URL
+        + ACCOUNTS
+        + "/"
+        + data[CUSTOMER_ID]
+        + "/"
+        + REMEMBER_ME_TOKEN,
+        headers={
+            CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
+            CONF_AUTH_TOKEN: data[TOKEN],
+        },
+        priority=PRIORITY_HIGH,
+    )
 
-        if rememberMeTokenResponse is not None and (
-            (
-                ACCESS_DENIED in rememberMeTokenResponse
-                and rememberMeTokenResponse[CAUSE] == NOT_AUTHENTICATED
-            )
-            or (
-                TYPE in rememberMeTokenResponse
-                and rememberMeTokenResponse[TYPE] == CLIENT_ERROR
-            )
-        ):
-            authResponse = await authenticateUser(self, userData, fingerprint)
+    if rememberMeTokenResponse is not None and (
+        (
+            ACCESS_DENIED in rememberMeTokenResponse
+            and rememberMeTokenResponse[CAUSE] == NOT_AUTHENTICATED
+        )
+        or (
+            TYPE in rememberMeTokenResponse
+            and rememberMeTokenResponse[TYPE] == CLIENT_ERROR
+        )
+    ):
+        authResponse = await authenticateUser(self, userData, fingerprint)
 
-            userData[CUSTOMERS][fingerprint][TOKEN] = authResponse[TOKEN]
-            userData[CUSTOMERS][fingerprint][CUSTOMER_ID] = authResponse[CUSTOMER_ID]
-        else:
-            if CUSTOMERS in userData and fingerprint in userData[CUSTOMERS]:
-                userData[CUSTOMERS][fingerprint][X_REMEMBER_ME_TOKEN] = (
-                    rememberMeTokenResponse[TOKEN]
-                )
-            else:
-                data[X_REMEMBER_ME_TOKEN] = rememberMeTokenResponse[TOKEN]
+        userData[CUSTOMERS][fingerprint][TOKEN] = authResponse[TOKEN]
+        userData[CUSTOMERS][fingerprint][CUSTOMER_ID] = authResponse[CUSTOMER_ID]
+    else:
+        data[X_REMEMBER_ME_TOKEN] = rememberMeTokenResponse[TOKEN]
 
-            entries = self.hass.config_entries.async_entries(DOMAIN)
-            for entry in entries:
-                updated_data = entry.data.copy()
-                updated_data.update(userData)
-                self.hass.config_entries.async_update_entry(entry, data=updated_data)
+        userData = updateEntries(self, userData)
 
-        del rememberMeTokenResponse
+    del rememberMeTokenResponse
 
-        return userData
+    return userData
 
 
 async def refreshToken(self, userData, fingerprint):
     """Refresh Token."""
 
     data = userData[CUSTOMERS][fingerprint]
-    rememberMeResp = await self.session.request(
+    rememberMeResponse = await self.client.request(
         method="GET",
         url=USER_PROFILE_URL + ACCOUNTS + "/" + REMEMBER_ME,
         headers={
             CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
             X_REMEMBER_ME_TOKEN: data[X_REMEMBER_ME_TOKEN],
         },
+        priority=PRIORITY_HIGH,
     )
-    rememberMeResponse = await rememberMeResp.json()
-
-    users = await rememberMeToken(self, userData, fingerprint)
 
-    users[TOKEN] = rememberMeResponse[TOKEN]
+    if TOKEN in rememberMeResponse:
+        data[TOKEN] = rememberMeResponse[TOKEN]
 
-    entries = self.hass.config_entries.async_entries(DOMAIN)
-    for entry in entries:
-        updated_data = entry.data.copy()
-        updated_data.update(users)
-        self.hass.config_entries.async_update_entry(entry, data=updated_data)
-        users = updated_data
+    users = await rememberMeToken(self, userData, fingerprint)
 
-    return users
+    return updateEntries(self, users)
 
 
 async def getFlights(self, data):
     """Get Flights."""
-    body = None
-    async with ClientSession() as session:
-        try:
-            resp = await session.request(
-                method="GET",
-                url=ORDERS_URL + ORDERS + data[CUSTOMER_ID] + "/" + DETAILS,
-                headers={
-                    "Content-Type": CONTENT_TYPE_JSON,
-                    CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
-                    CONF_AUTH_TOKEN: data[TOKEN],
-                },
-            )
-            body = await resp.json()
-            # Process body if needed
-        except ClientError as e:
-            raise UpdateFailed(f"Error fetching flights: {e}") from e
-        finally:
-            del resp
+    try:
+        body = await self.client.request(
+            method="GET",
+            url=ORDERS_URL + ORDERS + data[CUSTOMER_ID] + "/" + DETAILS,
+            headers={
+                "Content-Type": CONTENT_TYPE_JSON,
+                CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
+                CONF_AUTH_TOKEN: data[TOKEN],
+            },
+            priority=PRIORITY_MEDIUM,
+        )
+    except ClientError as e:
+        raise UpdateFailed(f"Error fetching flights: {e}") from e
 
-    return body
+    # Keep only what the platforms read rather than every rawBooking field.
+    return projectOrders(body)
+
+
+async def getHistory(self, data):
+    """Get past orders."""
+    try:
+        body = await self.client.request(
+            method="GET",
+            url=ORDERS_URL + ORDERS + data[CUSTOMER_ID] + "/" + HISTORY,
+            headers={
+                "Content-Type": CONTENT_TYPE_JSON,
+                CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
+                CONF_AUTH_TOKEN: data[TOKEN],
+            },
+            priority=PRIORITY_LOW,
+        )
+    except ClientError as e:
+        raise UpdateFailed(f"Error fetching history: {e}") from e
+
+    return projectOrders(body)
 
 
 async def getUserProfile(self, data):
     """Get user profile."""
-    resp = await self.session.request(
+    return await self.client.request(
         method="GET",
         url=USER_PROFILE_URL + CUSTOMERS + "/" + data[CUSTOMER_ID] + "/" + PROFILE,
         headers={
@@ -183,14 +228,13 @@ async def getUserProfile(self, data):
             CONF_DEVICE_FINGERPRINT: data[CONF_DEVICE_FINGERPRINT],
             CONF_AUTH_TOKEN: data[TOKEN],
         },
+        priority=PRIORITY_LOW,
     )
 
-    return await resp.json()
-
 
 async def getBoardingPasses(self, data, headers):
     """Get boarding passes."""
-    resp = await self.session.request(
+    return await self.client.request(
         method="POST",
         url=BOARDING_PASS_URL,
         headers={
@@ -199,14 +243,15 @@ async def getBoardingPasses(self, data, headers):
             CONF_AUTH_TOKEN: data[TOKEN],
         },
         json={EMAIL: headers[EMAIL], RECORD_LOCATOR: headers[RECORD_LOCATOR]},
+        priority=PRIORITY_HIGH,
+        # A POST, but only reads the passes.
+        coalesce=True,
     )
 
-    return await resp.json()
 
-
-async def getBookingDetails(self, data, bookingInfo):
+async def getBookingDetails(self, data, bookingInfo, priority=PRIORITY_MEDIUM):
     """Get booking details."""
-    resp = await self.session.request(
+    return await self.client.request(
         method="POST",
         url=BOOKING_DETAILS_URL,
         headers={
@@ -216,14 +261,15 @@ async def getBookingDetails(self, data, bookingInfo):
             CONF_AUTH_TOKEN: data[TOKEN],
         },
         json={AUTH_TOKEN: data[TOKEN], BOOKING_INFO: bookingInfo},
+        priority=priority,
+        # A POST, but only reads the booking.
+        coalesce=True,
     )
 
-    return await resp.json()
-
 
 async def authenticateUser(self, userData, fingerprint):
     """Authenticate USer."""
-    resp = await self.session.request(
+    return await self.client.request(
         method="POST",
         url=USER_PROFILE_URL + ACCOUNT_LOGIN,
         headers={
@@ -235,15 +281,107 @@ async def authenticateUser(self, userData, fingerprint):
             CONF_PASSWORD: userData[CONF_PASSWORD],
             CONF_POLICY_AGREED: "true",
         },
+        priority=PRIORITY_HIGH,
+    )
+
+
+def isConnectionError(err: BaseException) -> bool:
+    """Return True if an update failed because the API could not be reached."""
+    return isinstance(err, (ClientConnectionError, TimeoutError)) or isinstance(
+        err.__cause__, (ClientConnectionError, TimeoutError)
     )
 
-    return await resp.json()
 
+def renderBoardingPasses(barcodes: dict[Path, str]) -> None:
+    """Render boarding pass barcodes to their files, in the executor."""
+    for path, barcode in barcodes.items():
+        AztecCode(barcode).save(path, module_size=16)
 
-class RyanairBookingDetailsCoordinator(DataUpdateCoordinator):
-    """Booking Details Coordinator."""
 
-    def __init__(self, hass: HomeAssistant, session, deviceFingerprint, data) -> None:
+class RyanairOfflineCoordinator(DataUpdateCoordinator, ABC):
+    """Coordinator that rides out losing the connection to the API.
+
+    While the API can't be reached, the last good data keeps being served and
+    the coordinator is marked offline, so entities stay available and can
+    show how old their data is. The API is retried with exponential backoff
+    rather than on every refresh. Subclasses implement _async_fetch_data.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Initialize coordinator."""
+        super().__init__(*args, **kwargs)
+        self.offline = False
+        self.lastFetched: datetime | None = None
+        self._failures = 0
+        self._retryAt: datetime | None = None
+
+    @property
+    def dataAge(self) -> int | None:
+        """Return the seconds since the data was last fetched."""
+        if self.lastFetched is None:
+            return None
+        return int((dt_util.utcnow() - self.lastFetched).total_seconds())
+
+    @abstractmethod
+    async def _async_fetch_data(self):
+        """Fetch data from API endpoint."""
+
+    async def _async_update_data(self):
+        """Fetch data, or serve the last good data while offline."""
+        now = dt_util.utcnow()
+        if self.offline and self._retryAt is not None and now < self._retryAt:
+            return self.data
+
+        try:
+            data = await self._async_fetch_data()
+        except (UpdateFailed, ClientError, TimeoutError) as err:
+            if self.data is None or not isConnectionError(err):
+                raise
+
+            self._failures += 1
+            self._retryAt = now + min(
+                OFFLINE_RETRY_MIN * 2 ** (self._failures - 1), OFFLINE_RETRY_MAX
+            )
+            if not self.offline:
+                _LOGGER.warning(
+                    "Ryanair API unreachable, serving data from %s: %s",
+                    self.lastFetched,
+                    err,
+                )
+            self.offline = True
+            return self.data
+
+        self._fetched(now)
+        return data
+
+    def _fetched(self, now: datetime) -> None:
+        """Record that the API was reached."""
+        if self.offline:
+            _LOGGER.info("Ryanair API reachable again")
+        self.offline = False
+        self._failures = 0
+        self._retryAt = None
+        self.lastFetched = now
+
+
+class RyanairBookingDetailsCoordinator(RyanairOfflineCoordinator):
+    """Booking Details Coordinator.
+
+    Resolves the details of every active booking of an account, keyed by
+    bookingId. Details are fetched once per booking and memoized, so a cycle
+    only costs requests for bookings that have appeared since the last one.
+    Frozen bookings are left out, as nothing needs their details any more.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        userData,
+        fingerprint,
+        store,
+        flightsCoordinator,
+    ) -> None:
         """Initialize coordinator."""
 
         super().__init__(
@@ -255,24 +393,106 @@ class RyanairBookingDetailsCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(minutes=5),
         )
         self.hass = hass
-        self.session = session
-        self.data = data
-        self.fingerprint = deviceFingerprint
+        self.client = client
+        self.userData = userData
+        self.fingerprint = fingerprint
+        self.store = store
+        self.flightsCoordinator = flightsCoordinator
+        # recordLocator -> contact email, as needed by the boarding pass API.
+        self.emails: dict[str, str] = {}
+        # bookingIds to fetch again on the next refresh, although memoized.
+        self.refetch: set[str] = set()
+
+    async def async_refresh_booking(self, bookingRef: str) -> None:
+        """Fetch the details of one booking again, leaving the others memoized."""
+        self.refetch |= {
+            item[PRODUCT_ID]
+            for item in (self.flightsCoordinator.data or {}).get("items", [])
+            if item["rawBooking"]["recordLocator"] == bookingRef
+        }
+        await self.async_refresh()
+
+    async def _fetchDetails(self, bookingId, rawBooking):
+        """Fetch the details of one booking."""
+        customer = self.userData[CUSTOMERS][self.fingerprint]
+        bookingInfo = {BOOKING_ID: bookingId, SURROGATE_ID: customer[CUSTOMER_ID]}
+
+        departure = nextDeparture(rawBooking)
+        priority = (
+            PRIORITY_HIGH
+            if departure is not None
+            and departure - dt_util.utcnow() < IMMINENT_DEPARTURE
+            else PRIORITY_MEDIUM
+        )
 
-    async def _async_update_data(self):
+        return await getBookingDetails(self, customer, bookingInfo, priority)
+
+    async def _async_fetch_data(self):
         """Fetch data from API endpoint."""
         try:
-            if X_REMEMBER_ME_TOKEN not in self.data:
-                self.data = await rememberMeToken(self, self.data, self.fingerprint)
-
-            body = await getBookingDetails(self, self.data)
-
-            if (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED) or (
-                TYPE in body and body[TYPE] == CLIENT_ERROR
-            ):
-                self.data = await refreshToken(self, self.data, self.fingerprint)
+            bookings = {
+                item[PRODUCT_ID]: item["rawBooking"]
+                for item in (self.flightsCoordinator.data or {}).get("items", [])
+                if not self.store.isFrozen(item[PRODUCT_ID])
+            }
+            details = {
+                bookingId: body
+                for bookingId, body in (self.data or {}).items()
+                if bookingId in bookings and bookingId not in self.refetch
+            }
+            pending = [bookingId for bookingId in bookings if bookingId not in details]
+
+            if pending:
+                if (
+                    X_REMEMBER_ME_TOKEN
+                    not in self.userData[CUSTOMERS][self.fingerprint]
+                ):
+                    self.userData = await rememberMeToken(
+                        self, self.userData, self.fingerprint
+                    )
+
+                bodies = await asyncio.gather(
+                    *(
+                        self._fetchDetails(bookingId, bookings[bookingId])
+                        for bookingId in pending
+                    )
+                )
 
-                body = await getBookingDetails(self, self.data)
+                if any(
+                    (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED)
+                    or (TYPE in body and body[TYPE] == CLIENT_ERROR)
+                    for body in bodies
+                ):
+                    self.userData = await refreshToken(
+                        self, self.userData, self.fingerprint
+                    )
+
+                    bodies = await asyncio.gather(
+                        *(
+                            self._fetchDetails(bookingId, bookings[bookingId])
+                            for bookingId in pending
+                        )
+                    )
+
+                for bookingId, body in zip(pending, bodies, strict=True):
+                    # Unresolved bookings are retried on the next cycle.
+                    if "contacts" in body and len(body["contacts"]) > 0:
+                        details[bookingId] = body
+                        self.refetch.discard(bookingId)
+                        self.emails[bookings[bookingId]["recordLocator"]] = body[
+                            "contacts"
+                        ][0]["email"]
+
+            # Whatever could not be fetched again is still better than nothing.
+            for bookingId in self.refetch & bookings.keys():
+                if bookingId not in details and bookingId in (self.data or {}):
+                    details[bookingId] = self.data[bookingId]
+            self.refetch &= bookings.keys()
+
+            recordLocators = {booking["recordLocator"] for booking in bookings.values()}
+            for recordLocator in list(self.emails):
+                if recordLocator not in recordLocators:
+                    self.emails.pop(recordLocator)
 
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
@@ -291,13 +511,29 @@ class RyanairBookingDetailsCoordinator(DataUpdateCoordinator):
         except ClientError as error:
             raise UpdateFailed(f"Error communicating with API: {error}") from error
         else:
-            return body
+            return details
 
 
-class RyanairBoardingPassCoordinator(DataUpdateCoordinator):
-    """Boarding Pass Coordinator."""
+class RyanairBoardingPassCoordinator(RyanairOfflineCoordinator):
+    """Boarding Pass Coordinator.
 
-    def __init__(self, hass: HomeAssistant, session, data) -> None:
+    Passes of active bookings are fetched and rendered, while those of frozen
+    bookings are served from the store.
+
+    Fetched passes are pinned until a day after departure and re-fetched at a
+    low rate. When a passenger checks in, the passes of their booking are
+    fetched straight away, so they are on hand before they are needed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client,
+        userData,
+        fingerprint,
+        store,
+        bookingDetailsCoordinator,
+    ) -> None:
         """Initialize coordinator."""
 
         super().__init__(
@@ -306,86 +542,147 @@ class RyanairBoardingPassCoordinator(DataUpdateCoordinator):
             # Name of the data. For logging purposes.
             name="Ryanair",
             # Polling interval. Will only be polled if there are subscribers.
-            update_interval=timedelta(5),
+            update_interval=timedelta(hours=1),
+        )
+        self.client = client
+        self.userData = userData
+        self.fingerprint = fingerprint
+        self.store = store
+        self.bookingDetailsCoordinator = bookingDetailsCoordinator
+        # recordLocator -> (when its passes were fetched, the passes)
+        self.pinned: dict[str, tuple[datetime, list[JsonObjectType]]] = {}
+        # recordLocators to fetch on the next refresh whatever their age.
+        self.prefetch: set[str] = set()
+        self._checkedIn: set[tuple[str, int, int]] | None = None
+
+    @callback
+    def async_check_in_changed(self) -> None:
+        """Prefetch the passes of bookings with passengers newly checked in.
+
+        Called after each booking details refresh, which follows the flights
+        refresh that brings the check-in state, so the contact email needed
+        to fetch the passes of a new booking is known by then.
+        """
+        flightsData = self.bookingDetailsCoordinator.flightsCoordinator.data
+        checkedIn = {
+            (item["rawBooking"]["recordLocator"], journeyNum, paxNum)
+            for item in (flightsData or {}).get("items", [])
+            if not self.store.isFrozen(item[PRODUCT_ID])
+            for journeyNum, paxNum in checkedInPassengers(item["rawBooking"])
+        }
+
+        previous, self._checkedIn = self._checkedIn, checkedIn
+        if previous is None:
+            return
+
+        newlyCheckedIn = {recordLocator for recordLocator, _, _ in checkedIn - previous}
+        if newlyCheckedIn:
+            _LOGGER.debug("Prefetching boarding passes of %s", newlyCheckedIn)
+            self.prefetch |= newlyCheckedIn
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_refresh_booking(self, bookingRef: str) -> None:
+        """Fetch the passes of one booking again, serving the others pinned."""
+        self.prefetch.add(bookingRef)
+        await self.async_refresh()
+
+    def _isPinned(self, recordLocator: str, now: datetime) -> bool:
+        """Return True if the pinned passes of a booking are still good."""
+        if recordLocator in self.prefetch or recordLocator not in self.pinned:
+            return False
+
+        fetched, passes = self.pinned[recordLocator]
+        if now - fetched < PASS_REVALIDATE_INTERVAL:
+            return True
+
+        # Passes whose flights have all gone are no longer worth re-fetching.
+        return bool(passes) and all(
+            parseUTC(boardingPass["departure"]["dateUTC"]) + PASS_PIN_AFTER_DEPARTURE
+            < now
+            for boardingPass in passes
+            if "departure" in boardingPass
         )
-        self.session = session
-        self.email = data[EMAIL]
-        self.fingerprint = data[CONF_DEVICE_FINGERPRINT]
-        self.data = data
 
-    async def _async_update_data(self):
+    async def _async_fetch_data(self):
         """Fetch data from API endpoint."""
         try:
-            boardingPassData = await async_load_json_object(self.hass, "")
-
-            if self.fingerprint in boardingPassData:
-                bookingReferences = boardingPassData[self.fingerprint]
-
-            if len(bookingReferences) > 0:
-                for bookingRef in bookingReferences:
-                    headers = {
-                        EMAIL: self.email,
-                        RECORD_LOCATOR: bookingRef[BOOKING_REFERENCE],
-                    }
-
-                    if X_REMEMBER_ME_TOKEN not in self.data:
-                        self.data = await rememberMeToken(
-                            self, self.data, self.fingerprint
+            boardingPasses = []
+            now = dt_util.utcnow()
+
+            flightsData = self.bookingDetailsCoordinator.flightsCoordinator.data
+            for item in (flightsData or {}).get("items", []):
+                if self.store.isFrozen(item[PRODUCT_ID]):
+                    boardingPasses.extend(
+                        self.store.async_boarding_passes(
+                            item["rawBooking"]["recordLocator"], self.data
                         )
+                    )
+
+            emails = dict(self.bookingDetailsCoordinator.emails)
+            for bookingRef in list(self.pinned):
+                if bookingRef not in emails:
+                    del self.pinned[bookingRef]
+
+            for bookingRef, email in emails.items():
+                if self._isPinned(bookingRef, now):
+                    boardingPasses.extend(self.pinned[bookingRef][1])
+                    continue
+
+                headers = {
+                    EMAIL: email,
+                    RECORD_LOCATOR: bookingRef,
+                }
+
+                if (
+                    X_REMEMBER_ME_TOKEN
+                    not in self.userData[CUSTOMERS][self.fingerprint]
+                ):
+                    self.userData = await rememberMeToken(
+                        self, self.userData, self.fingerprint
+                    )
 
-                    body = await getBoardingPasses(self, self.data, headers)
+                body = await getBoardingPasses(
+                    self, self.userData[CUSTOMERS][self.fingerprint], headers
+                )
 
-                    if body is not None and (
-                        (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED)
-                        or (TYPE in body and body[TYPE] == CLIENT_ERROR)
-                    ):
-                        self.data = await refreshToken(
-                            self, self.data, self.fingerprint
+                if isinstance(body, dict) and (
+                    (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED)
+                    or (TYPE in body and body[TYPE] == CLIENT_ERROR)
+                ):
+                    self.userData = await refreshToken(
+                        self, self.userData, self.fingerprint
+                    )
+
+                    body = await getBoardingPasses(
+                        self, self.userData[CUSTOMERS][self.fingerprint], headers
+                    )
+
+                if isinstance(body, list):
+                    # Only barcodes that changed since the last fetch are
+                    # rendered again, off the event loop.
+                    rendered = {
+                        boardingPassPath(boardingPass): boardingPass["barcode"]
+                        for boardingPass in self.pinned.get(bookingRef, (now, []))[1]
+                        if "barcode" in boardingPass
+                    }
+                    barcodes = {}
+                    for boardingPass in body:
+                        if "barcode" not in boardingPass:
+                            continue
+                        path = boardingPassPath(boardingPass)
+                        if rendered.get(path) != boardingPass["barcode"]:
+                            barcodes[path] = boardingPass["barcode"]
+                    if barcodes:
+                        await self.hass.async_add_executor_job(
+                            renderBoardingPasses, barcodes
                         )
 
-                        body = await getBoardingPasses(self, self.data, headers)
-
-                    if body is not None:
-                        for boardingPass in body:
-                            if "barcode" in boardingPass:
-                                aztec_code = AztecCode(boardingPass["barcode"])
-
-                                flightName = (
-                                    "("
-                                    + boardingPass["flight"]["label"]
-                                    + ") "
-                                    + boardingPass["departure"]["name"]
-                                    + " - "
-                                    + boardingPass["arrival"]["name"]
-                                )
-
-                                seat = boardingPass["seat"]["designator"]
-
-                                passenger = (
-                                    boardingPass["name"]["first"]
-                                    + " "
-                                    + boardingPass["name"]["last"]
-                                )
-
-                                name = passenger + ": " + flightName + "(" + seat + ")"
-
-                                fileName = (
-                                    re.sub(
-                                        r"[\W_]",
-                                        "",
-                                        name + boardingPass["departure"]["dateUTC"],
-                                    )
-                                    + ".png"
-                                )
-
-                                aztec_code.save(
-                                    Path(__file__).parent
-                                    / BOARDING_PASSES_URI
-                                    / fileName,
-                                    module_size=16,
-                                )
-            else:
-                body = None
+                    boardingPasses.extend(body)
+                    self.pinned[bookingRef] = (now, body)
+                    self.prefetch.discard(bookingRef)
+                elif bookingRef in self.pinned:
+                    # Keep serving what was fetched last rather than nothing.
+                    boardingPasses.extend(self.pinned[bookingRef][1])
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
         except RyanairError as err:
@@ -403,13 +700,13 @@ class RyanairBoardingPassCoordinator(DataUpdateCoordinator):
         except ClientError as error:
             raise UpdateFailed(f"Error communicating with API: {error}") from error
         else:
-            return body
+            return boardingPasses
 
 
-class RyanairFlightsCoordinator(DataUpdateCoordinator):
+class RyanairFlightsCoordinator(RyanairOfflineCoordinator):
     """Flights Coordinator."""
 
-    def __init__(self, hass: HomeAssistant, session, data, fingerprint) -> None:
+    def __init__(self, hass: HomeAssistant, client, data, fingerprint, store) -> None:
         """Initialize coordinator."""
 
         super().__init__(
@@ -421,24 +718,68 @@ class RyanairFlightsCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(minutes=5),
         )
         self.hass = hass
-        self.session = session
-        self.data = data[CUSTOMERS][fingerprint]
+        self.client = client
+        self.userData = data
         self.fingerprint = fingerprint
+        self.store = store
 
-    async def _async_update_data(self):
+    async def _async_fetch_data(self):
         """Fetch data from API endpoint."""
+        return self.store.async_merge(await self._async_fetch_orders())
+
+    async def async_refresh_booking(self, bookingRef: str) -> None:
+        """Refresh the orders item of one booking, keeping the others as they are.
+
+        The orders API only lists every booking at once, but replacing just
+        the one item leaves nothing derived from the others to rebuild. Every
+        listener is still notified, as coordinators have no narrower way to;
+        the other items are passed on unchanged, so listeners comparing what
+        they derived from them find nothing to do.
+        """
+        now = dt_util.utcnow()
+        body = self.store.async_merge(await self._async_fetch_orders())
+        if not isinstance(body, dict) or "items" not in body:
+            raise UpdateFailed("Unexpected response fetching flights")
+
+        fresh = [
+            item
+            for item in body["items"]
+            if item["rawBooking"]["recordLocator"] == bookingRef
+        ]
+        items = []
+        for item in (self.data or {}).get("items", []):
+            if item["rawBooking"]["recordLocator"] != bookingRef:
+                items.append(item)
+            elif fresh:
+                items.extend(fresh)
+                fresh = []
+        items.extend(fresh)
+
+        # The whole orders list was fetched, so the data is as fresh as after
+        # a full refresh.
+        self._fetched(now)
+        self.async_set_updated_data({**(self.data or {}), "items": items})
+
+    async def _async_fetch_orders(self):
+        """Fetch the orders of the account."""
         try:
-            if X_REMEMBER_ME_TOKEN not in self.data:
-                self.data = await rememberMeToken(self, self.data, self.fingerprint)
+            if X_REMEMBER_ME_TOKEN not in self.userData[CUSTOMERS][self.fingerprint]:
+                self.userData = await rememberMeToken(
+                    self, self.userData, self.fingerprint
+                )
 
-            body = await getFlights(self, self.data)
+            body = await getFlights(self, self.userData[CUSTOMERS][self.fingerprint])
 
             if (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED) or (
                 TYPE in body and body[TYPE] == CLIENT_ERROR
             ):
-                self.data = await refreshToken(self, self.data, self.fingerprint)
+                self.userData = await refreshToken(
+                    self, self.userData, self.fingerprint
+                )
 
-                body = await getFlights(self, self.data)
+                body = await getFlights(
+                    self, self.userData[CUSTOMERS][self.fingerprint]
+                )
 
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
@@ -458,10 +799,17 @@ class RyanairFlightsCoordinator(DataUpdateCoordinator):
         return body
 
 
-class RyanairProfileCoordinator(DataUpdateCoordinator):
-    """User Profile Coordinator."""
+class RyanairHistoryCoordinator(DataUpdateCoordinator):
+    """Travel history coordinator.
+
+    Past orders are downloaded once to backfill the history, which is then
+    kept up to date from the bookings the flights coordinator sees complete.
+    They are downloaded again daily, for bookings that completed while Home
+    Assistant was not running; those already kept are skipped. Its data is the
+    compact history, keyed by productId.
+    """
 
-    def __init__(self, hass: HomeAssistant, session, data, fingerprint) -> None:
+    def __init__(self, hass: HomeAssistant, client, data, fingerprint, store) -> None:
         """Initialize coordinator."""
 
         super().__init__(
@@ -472,28 +820,109 @@ class RyanairProfileCoordinator(DataUpdateCoordinator):
             # Polling interval. Will only be polled if there are subscribers.
             update_interval=timedelta(minutes=5),
         )
-        self.session = session
-        self.data = data
+        self.client = client
+        self.userData = data
         self.fingerprint = fingerprint
+        self.store = store
 
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
+        synced = self.store.synced
+        if (
+            synced is not None
+            and dt_util.utcnow() - dt_util.parse_datetime(synced)
+            < HISTORY_RESYNC_INTERVAL
+        ):
+            return self.store.history
 
         try:
-            if self.data is not None and CONF_DEVICE_FINGERPRINT in self.data:
-                if X_REMEMBER_ME_TOKEN not in self.data:
-                    self.data = await rememberMeToken(self, self.data, self.fingerprint)
+            if X_REMEMBER_ME_TOKEN not in self.userData[CUSTOMERS][self.fingerprint]:
+                self.userData = await rememberMeToken(
+                    self, self.userData, self.fingerprint
+                )
 
-                body = await getUserProfile(self, self.data)
+            body = await getHistory(self, self.userData[CUSTOMERS][self.fingerprint])
 
-                if (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED) or (
-                    TYPE in body and body[TYPE] == CLIENT_ERROR
-                ):
-                    self.data = await refreshToken(self, self.data, self.fingerprint)
+            if (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED) or (
+                TYPE in body and body[TYPE] == CLIENT_ERROR
+            ):
+                self.userData = await refreshToken(
+                    self, self.userData, self.fingerprint
+                )
+
+                body = await getHistory(
+                    self, self.userData[CUSTOMERS][self.fingerprint]
+                )
+
+            if "items" not in body:
+                raise UpdateFailed("Unexpected response fetching history")
+
+            added = self.store.async_add_history(body["items"])
+            _LOGGER.debug("Synced %s past orders", added)
 
-                    body = await getUserProfile(self, self.data)
+        except InvalidAuth as err:
+            raise ConfigEntryAuthFailed from err
+        except RyanairError as err:
+            raise UpdateFailed(str(err)) from err
+        except ValueError as err:
+            err_str = str(err)
 
-                return body
+            if "Invalid authentication credentials" in err_str:
+                raise InvalidAuth from err
+            if "API rate limit exceeded." in err_str:
+                raise APIRatelimitExceeded from err
+
+            _LOGGER.exception("Unexpected exception")
+            raise UnknownError from err
+        except ClientError as error:
+            raise UpdateFailed(f"Error communicating with API: {error}") from error
+
+        return self.store.history
+
+
+class RyanairProfileCoordinator(RyanairOfflineCoordinator):
+    """User Profile Coordinator."""
+
+    def __init__(self, hass: HomeAssistant, client, data, fingerprint) -> None:
+        """Initialize coordinator."""
+
+        super().__init__(
+            hass,
+            _LOGGER,
+            # Name of the data. For logging purposes.
+            name="Ryanair",
+            # Polling interval. Will only be polled if there are subscribers.
+            update_interval=timedelta(minutes=5),
+        )
+        self.client = client
+        self.userData = data
+        self.fingerprint = fingerprint
+
+    async def _async_fetch_data(self):
+        """Fetch data from API endpoint."""
+
+        try:
+            if X_REMEMBER_ME_TOKEN not in self.userData[CUSTOMERS][self.fingerprint]:
+                self.userData = await rememberMeToken(
+                    self, self.userData, self.fingerprint
+                )
+
+            body = await getUserProfile(
+                self, self.userData[CUSTOMERS][self.fingerprint]
+            )
+
+            if (ACCESS_DENIED in body and body[CAUSE] == NOT_AUTHENTICATED) or (
+                TYPE in body and body[TYPE] == CLIENT_ERROR
+            ):
+                self.userData = await refreshToken(
+                    self, self.userData, self.fingerprint
+                )
+
+                body = await getUserProfile(
+                    self, self.userData[CUSTOMERS][self.fingerprint]
+                )
+
+            return body
 
         except InvalidAuth as err:
             raise ConfigEntryAuthFailed from err
@@ -516,7 +945,7 @@ class RyanairProfileCoordinator(DataUpdateCoordinator):
 class RyanairMfaCoordinator(DataUpdateCoordinator):
     """MFA coordinator."""
 
-    def __init__(self, hass: HomeAssistant, session, data) -> None:
+    def __init__(self, hass: HomeAssistant, client, data) -> None:
         """Initialize coordinator."""
 
         super().__init__(
@@ -528,7 +957,7 @@ class RyanairMfaCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(5),
         )
 
-        self.session = session
+        self.client = client
         self.mfaCode = data[MFA_CODE]
         self.mfaToken = data[MFA_TOKEN]
         self.fingerprint = data[CONF_DEVICE_FINGERPRINT]
@@ -536,7 +965,7 @@ class RyanairMfaCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
         try:
-            resp = await self.session.request(
+            return await self.client.request(
                 method="PUT",
                 url=USER_PROFILE_URL + ACCOUNT_VERIFICATION + "/" + DEVICE_VERIFICATION,
                 headers={
@@ -545,7 +974,6 @@ class RyanairMfaCoordinator(DataUpdateCoordinator):
                 },
                 json={MFA_CODE: self.mfaCode, MFA_TOKEN: self.mfaToken},
             )
-            return await resp.json()
             # session expired
             # {'access-denied': True, 'message': 'Full authentication is required to access this resource.', 'cause': 'NOT AUTHENTICATED'}
 
@@ -570,7 +998,7 @@ class RyanairMfaCoordinator(DataUpdateCoordinator):
 class RyanairCoordinator(DataUpdateCoordinator):
     """Data coordinator."""
 
-    def __init__(self, hass: HomeAssistant, session, userData, fingerprint) -> None:
+    def __init__(self, hass: HomeAssistant, client, userData, fingerprint) -> None:
         """Initialize coordinator."""
 
         super().__init__(
@@ -582,7 +1010,7 @@ class RyanairCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(5),
         )
         self.fingerprint = fingerprint
-        self.session = session
+        self.client = client
         self.userData = userData
 
     async def _async_update_data(self):
@@ -0,0 +1,25 @@
+"""Diagnostics support for Ryanair."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import BLOCKING_MONITOR, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    The code paths blocking the event loop are reported when the integration
+    is configured with debug_blocking.
+    """
+    monitor = hass.data.get(DOMAIN, {}).get(BLOCKING_MONITOR)
+    return {
+        "options": dict(entry.options),
+        "blocking": None if monitor is None else monitor.report(),
+    }
@@ -0,0 +1,189 @@
+"""Streaming export of Ryanair bookings."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonObjectType
+
+from .airports import AirportTable, async_get_airports
+from .bookings import HISTORY_SEGMENT_FIELDS, compactBooking
+from .calendar import FlightEvent, segmentEvents
+from .const import BOOKING_STORE, FLIGHTS_COORDINATOR, PRODUCT_ID
+from .websocket_api import ENTRY_ID, loadedAccounts
+
+EXPORT_URL = "/api/ryanair/export/{fileFormat}"
+FORMAT_ICS = "ics"
+FORMAT_JSONL = "jsonl"
+CONTENT_TYPES = {
+    FORMAT_ICS: "text/calendar; charset=utf-8",
+    FORMAT_JSONL: "application/jsonl; charset=utf-8",
+}
+# Lines are written out in batches of about this many characters.
+CHUNK_SIZE = 64 * 1024
+ICS_DATE_FORMAT = "%Y%m%dT%H%M%SZ"
+# iCalendar content lines are folded at 75 octets.
+ICS_LINE_LENGTH = 75
+
+
+def iterBookings(coordinators: dict[str, Any]) -> Iterator[tuple[str, JsonObjectType]]:
+    """Yield (productId, compact booking) for every booking of an account.
+
+    Bookings in the orders are compacted one at a time as they are read. The
+    history is only walked for the bookings the orders no longer list.
+    """
+    data = coordinators[FLIGHTS_COORDINATOR].data
+    seen = set()
+    for item in data.get("items", []) if isinstance(data, dict) else []:
+        seen.add(item[PRODUCT_ID])
+        yield item[PRODUCT_ID], compactBooking(item["rawBooking"])
+
+    # The history can grow while the export waits on the client, so its keys
+    # are read up front rather than iterated live.
+    history = coordinators[BOOKING_STORE].history
+    for productId in list(history):
+        if productId not in seen and productId in history:
+            yield productId, history[productId]
+
+
+def iterJsonLines(accounts: dict[str, dict[str, Any]]) -> Iterator[str]:
+    """Yield every booking of the accounts as a line of JSON."""
+    for entryId, coordinators in accounts.items():
+        for productId, booking in iterBookings(coordinators):
+            yield (
+                json_dumps(
+                    {
+                        ENTRY_ID: entryId,
+                        PRODUCT_ID: productId,
+                        **booking,
+                        "segments": [
+                            dict(zip(HISTORY_SEGMENT_FIELDS, row, strict=True))
+                            for row in booking["segments"]
+                        ],
+                    }
+                )
+                + "\n"
+            )
+
+
+def icsText(value: str) -> str:
+    """Escape a value for an iCalendar text property."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def icsLine(name: str, value: str) -> str:
+    """Return a folded iCalendar content line."""
+    line = f"{name}:{value}"
+    parts = []
+    limit = ICS_LINE_LENGTH
+    while len(line.encode("UTF-8")) > limit:
+        # Fold on a character boundary. Continuations start with a space.
+        cut = limit
+        while len(line[:cut].encode("UTF-8")) > limit:
+            cut -= 1
+        parts.append(line[:cut])
+        line = line[cut:]
+        limit = ICS_LINE_LENGTH - 1
+    parts.append(line)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def icsEvent(event: FlightEvent, stamp: str) -> str:
+    """Return a VEVENT for a flight."""
+    lines = [
+        "BEGIN:VEVENT\r\n",
+        icsLine("UID", icsText(event.uid or "")),
+        icsLine("DTSTAMP", stamp),
+        icsLine(
+            "DTSTART", event.start.astimezone(dt_util.UTC).strftime(ICS_DATE_FORMAT)
+        ),
+        icsLine("DTEND", event.end.astimezone(dt_util.UTC).strftime(ICS_DATE_FORMAT)),
+        icsLine("SUMMARY", icsText(event.summary)),
+    ]
+    if event.description:
+        lines.append(icsLine("DESCRIPTION", icsText(event.description)))
+    if event.location:
+        lines.append(icsLine("LOCATION", icsText(event.location)))
+    lines.append("END:VEVENT\r\n")
+    return "".join(lines)
+
+
+def iterCalendar(
+    accounts: dict[str, dict[str, Any]], airports: AirportTable, now: datetime
+) -> Iterator[str]:
+    """Yield an iCalendar file with every flight of the accounts."""
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Ryanair//Home Assistant//EN\r\n"
+
+    stamp = now.astimezone(dt_util.UTC).strftime(ICS_DATE_FORMAT)
+    for coordinators in accounts.values():
+        for _, booking in iterBookings(coordinators):
+            for event in segmentEvents(
+                booking["bookingRef"], booking["segments"], airports
+            ):
+                yield icsEvent(event, stamp)
+
+    yield "END:VCALENDAR\r\n"
+
+
+class RyanairExportView(HomeAssistantView):
+    """Download every booking as an iCalendar or JSON Lines file.
+
+    The file is generated while it is sent, in chunks, so memory use does
+    not grow with the number of bookings exported.
+    """
+
+    url = EXPORT_URL
+    name = "api:ryanair:export"
+
+    async def get(self, request: web.Request, fileFormat: str) -> web.StreamResponse:
+        """Stream the export."""
+        hass = request.app[KEY_HASS]
+        if fileFormat not in CONTENT_TYPES:
+            return self.json_message("Unknown export format", HTTPStatus.NOT_FOUND)
+
+        entryId = request.query.get(ENTRY_ID)
+        accounts = loadedAccounts(hass, entryId)
+        if entryId is not None and not accounts:
+            return self.json_message("Account not loaded", HTTPStatus.NOT_FOUND)
+
+        if fileFormat == FORMAT_ICS:
+            lines = iterCalendar(
+                accounts, await async_get_airports(hass), dt_util.utcnow()
+            )
+        else:
+            lines = iterJsonLines(accounts)
+
+        response = web.StreamResponse(
+            headers={
+                hdrs.CONTENT_TYPE: CONTENT_TYPES[fileFormat],
+                hdrs.CONTENT_DISPOSITION: f'attachment; filename="ryanair.{fileFormat}"',
+            }
+        )
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+
+        chunk: list[str] = []
+        size = 0
+        for line in lines:
+            chunk.append(line)
+            size += len(line)
+            if size >= CHUNK_SIZE:
+                await response.write("".join(chunk).encode("UTF-8"))
+                chunk.clear()
+                size = 0
+        await response.write("".join(chunk).encode("UTF-8"))
+        await response.write_eof()
+        return response
@@ -5,17 +5,15 @@ from __future__ import annotations
 import datetime as dt
 from datetime import datetime, timedelta
 import hashlib
-import os
 from pathlib import Path
-import re
 from typing import Any
 import uuid
 
 from homeassistant.components.image import ImageEntity, ImageEntityDescription
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
@@ -23,22 +21,28 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import JsonObjectType
 
+from .blocking import monitored
+from .bookings import (
+    boardingPassName,
+    boardingPassPath,
+    parseUTC,
+    passengerName,
+)
 from .const import (
-    BOARDING_PASSES_URI,
-    BOOKING_ID,
-    CONF_DEVICE_FINGERPRINT,
-    CUSTOMER_ID,
-    CUSTOMERS,
+    ARCHIVER,
+    BOARDING_PASS_COORDINATOR,
+    CONF_AGGREGATE_BOOKINGS,
+    COORDINATORS,
     DOMAIN,
-    EMAIL,
-    SURROGATE_ID,
-)
-from .coordinator import (
-    RyanairBoardingPassCoordinator,
-    RyanairBookingDetailsCoordinator,
+    SELECTED_PASSENGERS,
+    SIGNAL_PASSENGER_SELECTED,
 )
+from .coordinator import RyanairBoardingPassCoordinator
+from .lifecycle import removeBoardingPassFiles
 
 SCAN_INTERVAL = timedelta(5)
+# Shown for infants, who have no boarding pass of their own.
+INFANT_QR = Path(__file__).parent / "infant_qr.png"
 
 
 def deviceInfo(bookingRef) -> DeviceInfo:
@@ -57,112 +61,83 @@ def generate_device_fingerprint(email: str) -> str:
     return str(uuid.UUID(hex=unique_id))
 
 
-def getFileName(name) -> str:
-    """Get filename."""
-    return re.sub(r"[\W_]", "", name) + ".png"
-
-
 async def async_setup_platform(
     hass: HomeAssistant,
     config: ConfigType,
     async_add_entities: AddEntitiesCallback,
     _: DiscoveryInfoType | None = None,
+    aggregate: bool = False,
 ) -> None:
     """Set up the sensor platform."""
-    session = async_get_clientsession(hass)
-
     sensors = []
+    bookingRefs = []
+    stale = []
 
     deviceFingerprint = generate_device_fingerprint(config[CONF_EMAIL])
-    customerId = config[CUSTOMERS][deviceFingerprint][CUSTOMER_ID]
-
-    bookingData = {}
-    if deviceFingerprint in bookingData:
-        for booking in bookingData[deviceFingerprint]:
-            bookingInfo = {BOOKING_ID: booking[BOOKING_ID], SURROGATE_ID: customerId}
-
-            bookingDetailsCoordinator = RyanairBookingDetailsCoordinator(
-                hass, session, deviceFingerprint, bookingInfo
-            )
+    coordinators = hass.data[DOMAIN][COORDINATORS][deviceFingerprint]
+    boardPassCoordinator = coordinators[BOARDING_PASS_COORDINATOR]
 
-            await bookingDetailsCoordinator.async_config_entry_first_refresh()
+    archived = coordinators[ARCHIVER].archivedRefs()
 
-            if (
-                "contacts" in bookingDetailsCoordinator.data
-                and len(bookingDetailsCoordinator.data["contacts"]) > 0
-            ):
-                email = bookingDetailsCoordinator.data["contacts"][0]["email"]
+    if boardPassCoordinator.data is not None:
+        for boardingPass in boardPassCoordinator.data:
+            if "flight" in boardingPass:
+                name = boardingPassName(boardingPass)
 
-                data = {CONF_DEVICE_FINGERPRINT: deviceFingerprint, EMAIL: email}
-                boardPassCoordinator = RyanairBoardingPassCoordinator(
-                    hass, session, data
+                boardingPassDescription = ImageEntityDescription(
+                    key=f"Ryanair_boarding_pass{name}",
+                    name=name,
                 )
 
-                await boardPassCoordinator.async_config_entry_first_refresh()
-
-                if boardPassCoordinator.data is not None:
-                    for boardingPass in boardPassCoordinator.data:
-                        if "flight" in boardingPass:
-                            flightName = (
-                                "("
-                                + boardingPass["flight"]["label"]
-                                + ") "
-                                + boardingPass["departure"]["name"]
-                                + " - "
-                                + boardingPass["arrival"]["name"]
-                            )
-
-                            seat = boardingPass["seat"]["designator"]
-
-                            passenger = (
-                                boardingPass["name"]["first"]
-                                + " "
-                                + boardingPass["name"]["last"]
-                            )
-
-                            name = passenger + ": " + flightName + "(" + seat + ")"
-
-                            boardingPassDescription = ImageEntityDescription(
-                                key=f"Ryanair_boarding_pass{name}",
-                                name=name,
-                            )
-
-                            now_utc = dt_util.utcnow().timestamp()
-
-                            fileName = Path(__file__).parent / (
-                                BOARDING_PASSES_URI
-                                + "/"
-                                + getFileName(
-                                    name + boardingPass["departure"]["dateUTC"]
-                                )
-                            )
-
-                            nextDay = (
-                                datetime.strptime(
-                                    boardingPass["departure"]["dateUTC"],
-                                    "%Y-%m-%dT%H:%M:%SZ",
-                                )
-                                + dt.timedelta(days=1)
-                            ).timestamp()
-
-                            if now_utc > nextDay:
-                                if fileName and os.path.isfile(fileName):
-                                    os.remove(fileName)
-                            else:
-                                sensors.append(
-                                    RyanairBoardingPassImage(
-                                        hass,
-                                        boardPassCoordinator,
-                                        boardingPass,
-                                        boardingPass["pnr"],
-                                        name,
-                                        boardingPassDescription,
-                                    )
-                                )
+                now_utc = dt_util.utcnow().timestamp()
+
+                nextDay = (
+                    datetime.strptime(
+                        boardingPass["departure"]["dateUTC"],
+                        "%Y-%m-%dT%H:%M:%SZ",
+                    )
+                    + dt.timedelta(days=1)
+                ).timestamp()
+
+                if boardingPass["pnr"] in archived:
+                    # The archiver deletes their files.
+                    continue
+                if now_utc > nextDay:
+                    stale.append(boardingPass)
+                elif aggregate:
+                    if boardingPass["pnr"] not in bookingRefs:
+                        bookingRefs.append(boardingPass["pnr"])
+                else:
+                    sensors.append(
+                        RyanairBoardingPassImage(
+                            hass,
+                            boardPassCoordinator,
+                            boardingPass,
+                            boardingPass["pnr"],
+                            name,
+                            boardingPassDescription,
+                        )
+                    )
+
+    # The files of passes whose flights have gone are deleted off the loop.
+    if stale:
+        await hass.async_add_executor_job(removeBoardingPassFiles, stale)
+
+    # One image per booking, showing the pass chosen with its passenger select.
+    sensors.extend(
+        RyanairBookingBoardingPassImage(
+            hass,
+            boardPassCoordinator,
+            bookingRef,
+            coordinators[SELECTED_PASSENGERS],
+        )
+        for bookingRef in bookingRefs
+    )
 
     async_add_entities(sensors, update_before_add=True)
 
 
+@monitored("image setup")
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -172,7 +147,12 @@ async def async_setup_entry(
 
     config = hass.data[DOMAIN][entry.entry_id]
     # Update our config to include new repos and remove those that have been removed.
-    await async_setup_platform(hass, config, async_add_entities)
+    await async_setup_platform(
+        hass,
+        config,
+        async_add_entities,
+        aggregate=entry.options.get(CONF_AGGREGATE_BOOKINGS, False),
+    )
 
 
 class RyanairBoardingPassImage(
@@ -211,25 +191,22 @@ class RyanairBoardingPassImage(
         self._current_qr_bytes: bytes | None = None
 
         if self.boardingPassData["paxType"] != "INF":
-            fileName = (
-                BOARDING_PASSES_URI
-                + "/"
-                + getFileName(self.name + self.boardingPassData["departure"]["dateUTC"])
-            )
+            self.image_path = boardingPassPath(self.boardingPassData)
         else:
-            fileName = "infant_qr.png"
-
-        self.file_name = fileName
+            self.image_path = INFANT_QR
 
     async def _fetch_image(self) -> bytes:
         """Fetch the Image."""
-        image_path = Path(__file__).parent / self.file_name
-        return await self.hass.async_add_executor_job(image_path.read_bytes)
+        return await self.hass.async_add_executor_job(self.image_path.read_bytes)
 
     async def async_image(self) -> bytes | None:
         """Return bytes of image."""
 
-        qr_bytes = await self._fetch_image()
+        try:
+            qr_bytes = await self._fetch_image()
+        except OSError:
+            # Keep showing the pass already served, e.g. at the gate offline.
+            return self._current_qr_bytes
 
         if self._current_qr_bytes != qr_bytes:
             self._attr_image_last_updated = dt_util.utcnow()
@@ -254,3 +231,140 @@ class RyanairBoardingPassImage(
         """Update the image entity data."""
 
         self._attr_image_last_updated = dt_util.utcnow()
+
+
+class RyanairBookingBoardingPassImage(
+    CoordinatorEntity[RyanairBoardingPassCoordinator], ImageEntity
+):
+    """The boarding passes of a booking, shown one at a time.
+
+    Shows the pass for the booking's next flight of the passenger chosen with
+    the booking's passenger select, or of its first passenger.
+    """
+
+    _unrecorded_attributes = frozenset({"passengers", "data_age"})
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: RyanairBoardingPassCoordinator,
+        bookingRef: str,
+        selectedPassengers: dict[str, str],
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        ImageEntity.__init__(self, hass)
+        self.bookingRef = bookingRef
+        self.selectedPassengers = selectedPassengers
+        self._attr_name = bookingRef + " Boarding Pass"
+        self._attr_device_info = deviceInfo(bookingRef)
+        self._attr_unique_id = f"Ryanair_boarding_pass-{bookingRef}".lower()
+        self._attrs: dict[str, Any] = {}
+        self.image_path: Path | None = None
+        # image path -> bytes of the passes served so far
+        self._images: dict[Path, bytes] = {}
+        self._selectPass()
+
+    def _selectPass(self) -> None:
+        """Pick the pass to show."""
+        nextDay = dt_util.utcnow() - timedelta(days=1)
+        passes = [
+            boardingPass
+            for boardingPass in self.coordinator.data or []
+            if boardingPass.get("pnr") == self.bookingRef
+            and "flight" in boardingPass
+            and parseUTC(boardingPass["departure"]["dateUTC"]) > nextDay
+        ]
+
+        if not passes:
+            self.image_path = None
+            self._attrs = {}
+            return
+
+        departure = min(boardingPass["departure"]["dateUTC"] for boardingPass in passes)
+        nextPasses = [
+            boardingPass
+            for boardingPass in passes
+            if boardingPass["departure"]["dateUTC"] == departure
+        ]
+        selected = next(
+            (
+                boardingPass
+                for boardingPass in nextPasses
+                if passengerName(boardingPass)
+                == self.selectedPassengers.get(self.bookingRef)
+            ),
+            nextPasses[0],
+        )
+
+        if selected["paxType"] != "INF":
+            imagePath = boardingPassPath(selected)
+        else:
+            imagePath = INFANT_QR
+
+        if imagePath != self.image_path:
+            self.image_path = imagePath
+            self._attr_image_last_updated = dt_util.utcnow()
+
+        self._attrs = {
+            "passenger": passengerName(selected),
+            "flight": selected["flight"]["label"],
+            "origin": selected["departure"]["name"],
+            "destination": selected["arrival"]["name"],
+            "depart": selected["departure"]["dateUTC"],
+            "seat": selected["seat"]["designator"],
+            "passengers": [passengerName(boardingPass) for boardingPass in nextPasses],
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the booking's passenger select."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_PASSENGER_SELECTED.format(self.bookingRef),
+                self._async_handle_passenger_selected,
+            )
+        )
+
+    @callback
+    def _async_handle_passenger_selected(self) -> None:
+        """Show the pass of the newly selected passenger."""
+        self._selectPass()
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._selectPass()
+        super()._handle_coordinator_update()
+
+    async def async_image(self) -> bytes | None:
+        """Return bytes of image."""
+        if self.image_path is None:
+            return None
+
+        try:
+            self._images[self.image_path] = await self.hass.async_add_executor_job(
+                self.image_path.read_bytes
+            )
+        except OSError:
+            # Keep showing a pass already served, e.g. at the gate offline.
+            if self.image_path not in self._images:
+                raise
+        return self._images[self.image_path]
+
+    @property
+    def icon(self) -> str:
+        """Return a representative icon."""
+        return "mdi:qrcode"
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return super().available and self.image_path is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Define entity attributes."""
+        return {**self._attrs, "data_age": self.coordinator.dataAge}
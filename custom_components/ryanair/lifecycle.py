@@ -0,0 +1,177 @@
+"""Archival of Ryanair bookings that have ended."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonObjectType
+
+from .bookings import (
+    HISTORY_SEGMENT_FIELDS,
+    boardingPassPath,
+    compactBooking,
+    parseUTC,
+)
+from .const import DOMAIN, PRODUCT_ID
+
+_LOGGER = logging.getLogger(__name__)
+
+ARRIVE = HISTORY_SEGMENT_FIELDS.index("arrive")
+# Devices are identified as Ryanair_<bookingRef> or Ryanair_<bookingRef> <flight>.
+DEVICE_PREFIX = "Ryanair_"
+
+
+def lastArrival(segments: list[list[Any]]) -> datetime | None:
+    """Return the arrival time of the last segment of a compact booking."""
+    return max((parseUTC(segment[ARRIVE]) for segment in segments), default=None)
+
+
+def removeBoardingPassFiles(boardingPasses: list[JsonObjectType]) -> None:
+    """Delete the rendered barcodes of boarding passes, in the executor."""
+    for boardingPass in boardingPasses:
+        if "flight" in boardingPass:
+            boardingPassPath(boardingPass).unlink(missing_ok=True)
+
+
+class RyanairArchiver:
+    """Retires the entities and devices of bookings that have ended.
+
+    A booking is archived once its last flight landed more than the grace
+    period ago. Its devices, and with them their entities, are removed from
+    the registries and the platforms no longer create entities for it, so the
+    registries stop growing with every trip, and its boarding pass files are
+    deleted. Once the orders response stops
+    listing it too, it is evicted from the booking store, living on only in
+    the history when that is enabled.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        store,
+        flightsCoordinator,
+        grace: timedelta,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.store = store
+        self.flightsCoordinator = flightsCoordinator
+        self.grace = grace
+        # (productId, compact) -> (booking the arrival was read from, arrival)
+        self._arrivals: dict[tuple[str, bool], tuple[Any, datetime | None]] = {}
+        self._pruned: frozenset[str] = frozenset()
+
+    def _arrival(self, productId: str, booking: Any, compact: bool) -> datetime | None:
+        """Return the last arrival of a booking, read once per version of it."""
+        cached = self._arrivals.get((productId, compact))
+        if cached is None or cached[0] is not booking:
+            segments = (
+                booking["segments"]
+                if compact
+                else compactBooking(booking["rawBooking"])["segments"]
+            )
+            cached = (booking, lastArrival(segments))
+            self._arrivals[(productId, compact)] = cached
+        return cached[1]
+
+    def isArchived(self, item: JsonObjectType) -> bool:
+        """Return True if an orders item has ended more than the grace ago."""
+        arrival = self._arrival(item[PRODUCT_ID], item, False)
+        return arrival is not None and arrival < dt_util.utcnow() - self.grace
+
+    def currentBookings(self, data: Any) -> Any:
+        """Return an orders response without its archived bookings."""
+        if not isinstance(data, dict) or "items" not in data:
+            return data
+        return {
+            **data,
+            "items": [item for item in data["items"] if not self.isArchived(item)],
+        }
+
+    def archivedRefs(self) -> frozenset[str]:
+        """Return the booking references of every archived booking."""
+        cutoff = dt_util.utcnow() - self.grace
+        data = self.flightsCoordinator.data
+        items = data.get("items", []) if isinstance(data, dict) else []
+
+        archived = set()
+        current = set()
+        for item in (*self.store.bookings.values(), *items):
+            arrival = self._arrival(item[PRODUCT_ID], item, False)
+            bookingRef = item["rawBooking"]["recordLocator"]
+            if arrival is not None and arrival < cutoff:
+                archived.add(bookingRef)
+            else:
+                current.add(bookingRef)
+
+        for productId, booking in self.store.history.items():
+            arrival = self._arrival(productId, booking, True)
+            if arrival is not None and arrival < cutoff:
+                archived.add(booking["bookingRef"])
+
+        return frozenset(archived - current)
+
+    @callback
+    def _async_evict(self) -> list[JsonObjectType]:
+        """Evict the archived bookings the orders response no longer lists.
+
+        Those still listed stay frozen, or their details and boarding passes
+        would be fetched again. Returns the boarding passes evicted.
+        """
+        data = self.flightsCoordinator.data
+        if not isinstance(data, dict) or "items" not in data:
+            return []
+
+        cutoff = dt_util.utcnow() - self.grace
+        listed = {item[PRODUCT_ID] for item in data["items"]}
+        evicted = []
+        for productId, item in self.store.bookings.items():
+            if productId in listed:
+                continue
+            arrival = self._arrival(productId, item, False)
+            if arrival is not None and arrival < cutoff:
+                evicted.append(productId)
+
+        if not evicted:
+            return []
+
+        _LOGGER.debug("Evicting %s archived bookings", len(evicted))
+        for productId in evicted:
+            self._arrivals.pop((productId, False), None)
+        return self.store.async_evict(evicted)
+
+    @callback
+    def async_prune(self) -> None:
+        """Retire the bookings archived since the last prune."""
+        boardingPasses = self._async_evict()
+        archived = self.archivedRefs()
+        if archived != self._pruned:
+            deviceRegistry = dr.async_get(self.hass)
+            for device in dr.async_entries_for_config_entry(
+                deviceRegistry, self.entry.entry_id
+            ):
+                for domain, identifier in device.identifiers:
+                    if domain != DOMAIN or not identifier.startswith(DEVICE_PREFIX):
+                        continue
+                    bookingRef = identifier.removeprefix(DEVICE_PREFIX).split(" ")[0]
+                    if bookingRef in archived:
+                        _LOGGER.debug("Archiving %s", device.name)
+                        deviceRegistry.async_update_device(
+                            device.id, remove_config_entry_id=self.entry.entry_id
+                        )
+                        break
+
+            for bookingRef in archived - self._pruned:
+                boardingPasses.extend(self.store.boardingPasses.get(bookingRef, []))
+            self._pruned = archived
+
+        if boardingPasses:
+            self.hass.async_add_executor_job(removeBoardingPassFiles, boardingPasses)
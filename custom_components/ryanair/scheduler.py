@@ -0,0 +1,146 @@
+"""Ryanair refresh scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN, MAX_CONCURRENT_REQUESTS, SCHEDULER
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_INTERVAL = timedelta(minutes=5)
+
+
+class RyanairScheduler:
+    """Spread the refreshes of every account evenly across the update interval.
+
+    Each account is given a fixed phase within the interval, so a dozen
+    accounts no longer poll in the same instant, and requests of all accounts
+    share a global limit on how many may be in flight at once.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: timedelta = UPDATE_INTERVAL,
+        maxConcurrentRequests: int = MAX_CONCURRENT_REQUESTS,
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.interval = interval
+        self.semaphore = asyncio.Semaphore(maxConcurrentRequests)
+        self._accounts: dict[str, list[DataUpdateCoordinator]] = {}
+        self._offsets: dict[str, float] = {}
+        self._unsubRefresh: dict[str, CALLBACK_TYPE] = {}
+        self._refreshTasks: dict[str, asyncio.Task[None]] = {}
+
+    @callback
+    def async_add_account(self, account: str) -> CALLBACK_TYPE:
+        """Add an account and return a callback that removes it again."""
+        self._accounts.setdefault(account, [])
+        self._async_rebalance()
+
+        @callback
+        def async_remove_account() -> None:
+            self._accounts.pop(account, None)
+            # A refresh still running would keep the account's coordinators
+            # and client alive after it is gone.
+            if (task := self._refreshTasks.pop(account, None)) is not None:
+                task.cancel()
+            self._async_rebalance()
+
+        return async_remove_account
+
+    @callback
+    def async_add_coordinator(
+        self, account: str, coordinator: DataUpdateCoordinator
+    ) -> None:
+        """Let the scheduler drive the refreshes of a coordinator."""
+        # The coordinator's own timer would poll in lockstep with every other
+        # account, so it is switched off in favour of the account's phase.
+        coordinator.update_interval = None
+
+        if account not in self._accounts:
+            self._accounts[account] = []
+            self._async_rebalance()
+        self._accounts[account].append(coordinator)
+
+    @callback
+    def _async_rebalance(self) -> None:
+        """Assign every account an evenly spaced phase and reschedule it."""
+        for unsub in self._unsubRefresh.values():
+            unsub()
+        self._unsubRefresh.clear()
+        self._offsets.clear()
+
+        accounts = sorted(self._accounts)
+        seconds = self.interval.total_seconds()
+        for index, account in enumerate(accounts):
+            self._offsets[account] = seconds * index / len(accounts)
+            self._async_schedule(account)
+
+        _LOGGER.debug("Refresh phases: %s", self._offsets)
+
+    @callback
+    def _async_schedule(self, account: str) -> None:
+        """Schedule the next refresh of an account at its phase."""
+        seconds = self.interval.total_seconds()
+        delay = (self._offsets[account] - time.time()) % seconds
+
+        @callback
+        def _async_refresh(_now: datetime) -> None:
+            self._async_handle_refresh(account)
+
+        self._unsubRefresh[account] = async_call_later(
+            self.hass,
+            delay or seconds,
+            HassJob(
+                _async_refresh, f"{DOMAIN} refresh {account}", cancel_on_shutdown=True
+            ),
+        )
+
+    @callback
+    def _async_handle_refresh(self, account: str) -> None:
+        """Refresh an account and schedule its next refresh."""
+        if account not in self._accounts:
+            return
+
+        self._async_schedule(account)
+        if (task := self._refreshTasks.get(account)) is not None and not task.done():
+            # The previous refresh is still waiting on the API.
+            return
+
+        task = self.hass.async_create_background_task(
+            self._async_refresh_account(account), f"{DOMAIN} refresh {account}"
+        )
+        self._refreshTasks[account] = task
+
+        @callback
+        def _async_refresh_done(done: asyncio.Task[None]) -> None:
+            if self._refreshTasks.get(account) is done:
+                del self._refreshTasks[account]
+
+        task.add_done_callback(_async_refresh_done)
+
+    async def _async_refresh_account(self, account: str) -> None:
+        """Refresh the coordinators of an account one after another."""
+        for coordinator in list(self._accounts.get(account, [])):
+            await coordinator.async_refresh()
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> RyanairScheduler:
+    """Return the scheduler shared by every Ryanair account."""
+    domainData = hass.data.setdefault(DOMAIN, {})
+
+    if SCHEDULER not in domainData:
+        domainData[SCHEDULER] = RyanairScheduler(hass)
+
+    return domainData[SCHEDULER]
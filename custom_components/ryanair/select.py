@@ -0,0 +1,127 @@
+"""Ryanair passenger select platform."""
+
+from __future__ import annotations
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .blocking import monitored
+from .bookings import iterSegments, parseItineraries
+from .const import (
+    ARCHIVER,
+    CONF_AGGREGATE_BOOKINGS,
+    COORDINATORS,
+    DOMAIN,
+    FLIGHTS_COORDINATOR,
+    SELECTED_PASSENGERS,
+    SIGNAL_PASSENGER_SELECTED,
+)
+from .coordinator import RyanairFlightsCoordinator
+from .sensor import deviceInfo, generate_device_fingerprint
+
+
+def bookingPassengers(data, bookingRef: str) -> list[str]:
+    """Return the names of the passengers of a booking, in booking order."""
+    passengers: list[str] = []
+    for itinerary in parseItineraries(data):
+        if itinerary["bookingRef"] != bookingRef:
+            continue
+        for _, _, flight in iterSegments([itinerary]):
+            for passenger in flight["passengers"]:
+                name = passenger["firstName"] + " " + passenger["lastName"]
+                if name not in passengers:
+                    passengers.append(name)
+    return passengers
+
+
+@monitored("select setup")
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the passenger selects from a config entry."""
+    if not entry.options.get(CONF_AGGREGATE_BOOKINGS, False):
+        return
+
+    config = hass.data[DOMAIN][entry.entry_id]
+    deviceFingerprint = generate_device_fingerprint(config[CONF_EMAIL])
+    coordinators = hass.data[DOMAIN][COORDINATORS][deviceFingerprint]
+    flightsCoordinator = coordinators[FLIGHTS_COORDINATOR]
+
+    async_add_entities(
+        RyanairPassengerSelect(
+            flightsCoordinator,
+            itinerary["bookingRef"],
+            coordinators[SELECTED_PASSENGERS],
+        )
+        for itinerary in parseItineraries(
+            coordinators[ARCHIVER].currentBookings(flightsCoordinator.data)
+        )
+    )
+
+
+class RyanairPassengerSelect(
+    CoordinatorEntity[RyanairFlightsCoordinator], SelectEntity, RestoreEntity
+):
+    """The passenger whose boarding pass a booking shows."""
+
+    _attr_icon = "mdi:account-switch"
+
+    def __init__(
+        self,
+        coordinator: RyanairFlightsCoordinator,
+        bookingRef: str,
+        selectedPassengers: dict[str, str],
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.bookingRef = bookingRef
+        self.selectedPassengers = selectedPassengers
+        self._attr_name = bookingRef + " Passenger"
+        self._attr_device_info = deviceInfo(bookingRef)
+        self._attr_unique_id = f"Ryanair_passenger-{bookingRef}".lower()
+        self._attr_options = bookingPassengers(coordinator.data, bookingRef)
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the selected passenger."""
+        selected = self.selectedPassengers.get(self.bookingRef)
+        if selected in self.options:
+            return selected
+        return self.options[0] if self.options else None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the passenger selected before a restart."""
+        await super().async_added_to_hass()
+        if (
+            self.bookingRef not in self.selectedPassengers
+            and (lastState := await self.async_get_last_state()) is not None
+            and lastState.state in self.options
+        ):
+            self._async_select(lastState.state)
+
+    async def async_select_option(self, option: str) -> None:
+        """Select a passenger."""
+        self._async_select(option)
+        self.async_write_ha_state()
+
+    @callback
+    def _async_select(self, option: str) -> None:
+        """Record the selection and tell the booking's boarding pass."""
+        self.selectedPassengers[self.bookingRef] = option
+        async_dispatcher_send(
+            self.hass, SIGNAL_PASSENGER_SELECTED.format(self.bookingRef)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_options = bookingPassengers(self.coordinator.data, self.bookingRef)
+        super()._handle_coordinator_update()
@@ -1,6 +1,8 @@
 """Ryanair sensor platform."""
 
-from datetime import datetime, timedelta
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
 import hashlib
 import logging
 from typing import Any
@@ -8,11 +10,15 @@ import uuid
 
 from aiohttp import ClientError
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_EMAIL
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.const import CONF_EMAIL, UnitOfLength, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
@@ -20,23 +26,96 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import JsonObjectType
 
+from .airports import AirportTable, async_get_airports
+from .blocking import monitored
+from .bookings import iterSegments, parseItineraries, parseItinerary, parseUTC
 from .const import (
     ACCESS_DENIED,
-    BOOKING_ID,
-    BOOKING_REFERENCE,
+    ARCHIVER,
+    BOOKING_STORE,
     CAUSE,
-    CONF_DEVICE_FINGERPRINT,
+    CONF_AGGREGATE_BOOKINGS,
+    COORDINATORS,
     CUSTOMER_ID,
     CUSTOMERS,
     DOMAIN,
-    PRODUCT_ID,
+    FLIGHTS_COORDINATOR,
+    PROFILE_COORDINATOR,
     TYPE,
 )
 from .coordinator import RyanairFlightsCoordinator, RyanairProfileCoordinator
+from .statistics import TravelStatistics
 
 _LOGGER = logging.getLogger(__name__)
 # Time between updating data from GitHub
 SCAN_INTERVAL = timedelta(minutes=5)
+# Profile fields exposed as attributes of the user profile sensor.
+PROFILE_ATTRIBUTES = (
+    "customerId",
+    "email",
+    "title",
+    "firstName",
+    "lastName",
+    "dateOfBirth",
+    "nationality",
+    "phoneNumber",
+    "googlePictureUrl",
+)
+PROFILE_UNRECORDED_ATTRIBUTES = (
+    "dateOfBirth",
+    "phoneNumber",
+    "googlePictureUrl",
+    "data_age",
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class RyanairStatisticDescription(SensorEntityDescription):
+    """Describes a travel statistics sensor."""
+
+    value_fn: Callable[[TravelStatistics], Any]
+    attributes_fn: Callable[[TravelStatistics], dict[str, Any]] | None = None
+
+
+STATISTIC_DESCRIPTIONS = (
+    RyanairStatisticDescription(
+        key="flights_this_year",
+        name="Flights This Year",
+        icon="mdi:airplane-landing",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda statistics: statistics.flightsThisYear,
+        attributes_fn=lambda statistics: {
+            "byYear": dict(sorted(statistics.flightsByYear.items()))
+        },
+    ),
+    RyanairStatisticDescription(
+        key="distance_flown",
+        name="Distance Flown",
+        icon="mdi:map-marker-distance",
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        suggested_display_precision=0,
+        value_fn=lambda statistics: round(statistics.distance, 1),
+    ),
+    RyanairStatisticDescription(
+        key="time_in_air",
+        name="Hours In The Air",
+        icon="mdi:clock-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        suggested_display_precision=1,
+        value_fn=lambda statistics: round(statistics.airTime, 2),
+    ),
+    RyanairStatisticDescription(
+        key="most_visited_airport",
+        name="Most Visited Airport",
+        icon="mdi:airport",
+        value_fn=lambda statistics: next(iter(statistics.mostVisited(1)), (None,))[0],
+        attributes_fn=lambda statistics: {"visits": dict(statistics.mostVisited())},
+    ),
+)
 
 
 def deviceInfo(name) -> DeviceInfo:
@@ -66,6 +145,7 @@ def generate_device_fingerprint(email: str) -> str:
     return str(uuid.UUID(hex=unique_id))
 
 
+@monitored("sensor setup")
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -75,7 +155,12 @@ async def async_setup_entry(
 
     config = hass.data[DOMAIN][entry.entry_id]
     # Update our config to include new repos and remove those that have been removed.
-    await async_setup_platform(hass, config, async_add_entities)
+    await async_setup_platform(
+        hass,
+        config,
+        async_add_entities,
+        aggregate=entry.options.get(CONF_AGGREGATE_BOOKINGS, False),
+    )
 
 
 async def async_setup_platform(
@@ -83,17 +168,13 @@ async def async_setup_platform(
     config: ConfigType,
     async_add_entities: AddEntitiesCallback,
     _: DiscoveryInfoType | None = None,
+    aggregate: bool = False,
 ) -> None:
     """Set up the sensor platform."""
-    session = async_get_clientsession(hass)
-
     deviceFingerprint = generate_device_fingerprint(config[CONF_EMAIL])
+    coordinators = hass.data[DOMAIN][COORDINATORS][deviceFingerprint]
 
-    profileCoordinator = RyanairProfileCoordinator(
-        hass, session, config, deviceFingerprint
-    )
-
-    await profileCoordinator.async_config_entry_first_refresh()
+    profileCoordinator = coordinators[PROFILE_COORDINATOR]
 
     name = config[CUSTOMERS][deviceFingerprint][CUSTOMER_ID]
 
@@ -102,11 +183,7 @@ async def async_setup_platform(
         name="User Profile",
     )
 
-    flightsCoordinator = RyanairFlightsCoordinator(
-        hass, session, config, deviceFingerprint
-    )
-
-    await flightsCoordinator.async_config_entry_first_refresh()
+    flightsCoordinator = coordinators[FLIGHTS_COORDINATOR]
 
     sensors = []
 
@@ -120,125 +197,49 @@ async def async_setup_platform(
             RyanairProfileSensor(profileCoordinator, name, profileDescription)
         )
 
+    airports = await async_get_airports(hass)
+
     upcomingFlights = 0
-    if "items" in flightsCoordinator.data and len(flightsCoordinator.data["items"]) > 0:
-        bookingReferences = {}
-        userBookings = []
-        for item in flightsCoordinator.data["items"]:
-            flights = item["rawBooking"]["flights"]
-            bookingRef = item["rawBooking"]["recordLocator"]
-            seats = item["rawBooking"]["seats"]
-            passengers = item["rawBooking"]["passengers"]
-
-            userBookings.append(
-                {
-                    BOOKING_ID: item[PRODUCT_ID],
-                    BOOKING_REFERENCE: bookingRef,
-                }
-            )
+    now_utc = dt_util.utcnow().timestamp()
+    itineraries = parseItineraries(
+        coordinators[ARCHIVER].currentBookings(flightsCoordinator.data)
+    )
+    for bookingRef, checkInInfo, flight in iterSegments(itineraries):
+        departUTC = parseUTC(flight["depart"]).timestamp()
 
-            itinerary = {
-                "status": item["rawBooking"]["status"],
-                "bookingRef": bookingRef,
-                "journeys": [],
-            }
-            for flight in flights:
-                journey = {
-                    "checkInOpen": flight["checkInOpenUTC"],
-                    "checkInClose": flight["checkInCloseUTC"],
-                    "checkInComplete": False,
-                    "flights": [],
-                }
+        if now_utc < departUTC:
+            upcomingFlights = upcomingFlights + 1
+
+        if aggregate:
+            continue
+
+        flightDescription = SensorEntityDescription(
+            key=f"Ryanair_flight{name}",
+            name=name,
+        )
 
-                segments = flight["segments"]
-
-                for segment in segments:
-                    segmentInfo = {
-                        "destination": segment["destination"],
-                        "origin": segment["origin"],
-                        "flightNumber": segment["flightNumber"],
-                        "isCancelled": segment["isCancelled"],
-                        "arrive": segment["times"]["arriveUTC"],
-                        "depart": segment["times"]["departUTC"],
-                        "checkInComplete": False,
-                        "passengers": [],
-                    }
-                    segmentPassengers = []
-                    checkedInPassengers = []
-                    for seat in seats:
-                        if (
-                            seat["journeyNum"] == flight["journeyNum"]
-                            and seat["segmentNum"] == segment["segmentNum"]
-                        ):
-                            for passenger in passengers:
-                                if seat["paxNum"] == passenger["paxNum"]:
-                                    passengerInfo = {
-                                        "seat": seat["code"],
-                                        "title": passenger["title"],
-                                        "firstName": passenger["firstName"],
-                                        "middleName": passenger["middleName"],
-                                        "lastName": passenger["lastName"],
-                                        "checkedIn": False,
-                                    }
-                                    if (
-                                        "checkins" in item["rawBooking"]
-                                        and len(item["rawBooking"]["checkins"]) > 0
-                                    ):
-                                        for checkin in item["rawBooking"]["checkins"]:
-                                            if (
-                                                checkin["journeyNum"]
-                                                == flight["journeyNum"]
-                                                and checkin["paxNum"]
-                                                == passenger["paxNum"]
-                                                and checkin["status"] == "checkin"
-                                            ):
-                                                checkedInPassengers.append(checkin)
-                                                passengerInfo["checkedIn"] = True
-                                    segmentPassengers.append(passengerInfo)
-
-                                if len(checkedInPassengers) == len(segmentPassengers):
-                                    segmentInfo["checkInComplete"] = True
-
-                            if len(checkedInPassengers) == len(passengers):
-                                journey["checkInComplete"] = True
-
-                    segmentInfo["passengers"] = segmentPassengers
-                    journey["flights"].insert(segment["segmentNum"], segmentInfo)
-
-                itinerary["journeys"].insert(flight["journeyNum"], journey)
-
-                for journey in itinerary["journeys"]:
-                    checkInInfo = {
-                        "checkInOpen": journey["checkInOpen"],
-                        "checkInClose": journey["checkInClose"],
-                    }
-
-                    for flight in journey["flights"]:
-                        now_utc = dt_util.utcnow().timestamp()
-
-                        departUTC = datetime.strptime(
-                            flight["depart"], "%Y-%m-%dT%H:%M:%SZ"
-                        ).timestamp()
-
-                        if now_utc < departUTC:
-                            upcomingFlights = upcomingFlights + 1
-
-                        flightDescription = SensorEntityDescription(
-                            key=f"Ryanair_flight{name}",
-                            name=name,
-                        )
-
-                        sensors.append(
-                            RyanairFlightSensor(
-                                flightsCoordinator,
-                                bookingRef,
-                                checkInInfo,
-                                flight,
-                                flightDescription,
-                            )
-                        )
-
-        bookingReferences[config[CONF_DEVICE_FINGERPRINT]] = userBookings
+        sensors.append(
+            RyanairFlightSensor(
+                flightsCoordinator,
+                bookingRef,
+                checkInInfo,
+                flight,
+                airports,
+                flightDescription,
+            )
+        )
+        sensors.extend(
+            RyanairSegmentTimeSensor(
+                flightsCoordinator, bookingRef, checkInInfo, flight, description
+            )
+            for description in SEGMENT_TIME_DESCRIPTIONS
+        )
+
+    if aggregate:
+        sensors.extend(
+            RyanairBookingSensor(flightsCoordinator, itinerary["bookingRef"])
+            for itinerary in itineraries
+        )
 
     flightCountDescription = SensorEntityDescription(
         key=f"Ryanair_flight-count{name}",
@@ -250,6 +251,19 @@ async def async_setup_platform(
         RyanairFlightCountSensor(upcomingFlights, name, flightCountDescription)
     )
 
+    statistics = TravelStatistics(airports, coordinators[BOOKING_STORE])
+    statistics.async_update(flightsCoordinator.data)
+    sensors.extend(
+        RyanairStatisticSensor(
+            flightsCoordinator,
+            statistics,
+            name,
+            config[CUSTOMERS][deviceFingerprint][CUSTOMER_ID],
+            description,
+        )
+        for description in STATISTIC_DESCRIPTIONS
+    )
+
     async_add_entities(sensors, update_before_add=True)
 
 
@@ -311,20 +325,171 @@ class RyanairFlightCountSensor(SensorEntity):
             )
 
 
+class RyanairStatisticSensor(
+    CoordinatorEntity[RyanairFlightsCoordinator], SensorEntity
+):
+    """Ryanair travel statistics sensor."""
+
+    entity_description: RyanairStatisticDescription
+
+    def __init__(
+        self,
+        coordinator: RyanairFlightsCoordinator,
+        statistics: TravelStatistics,
+        name: str,
+        customerId: str,
+        description: RyanairStatisticDescription,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.statistics = statistics
+        self.entity_description = description
+        self._attr_device_info = deviceInfo(name)
+        self._attr_unique_id = f"{DOMAIN}-{customerId}-{description.key}".lower()
+
+    @property
+    def native_value(self) -> Any:
+        """Native value."""
+        return self.entity_description.value_fn(self.statistics)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Define entity attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.statistics)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Add newly landed flights to the totals."""
+        self.statistics.async_update(self.coordinator.data)
+        super()._handle_coordinator_update()
+
+
+@dataclass(frozen=True, kw_only=True)
+class RyanairSegmentTimeDescription(SensorEntityDescription):
+    """Describes a segment timestamp sensor."""
+
+    value_fn: Callable[[JsonObjectType, JsonObjectType], str]
+
+
+SEGMENT_TIME_DESCRIPTIONS = (
+    RyanairSegmentTimeDescription(
+        key="check_in_open",
+        name="Check-in Opens",
+        icon="mdi:clock-start",
+        value_fn=lambda checkInInfo, _: checkInInfo["checkInOpen"],
+    ),
+    RyanairSegmentTimeDescription(
+        key="check_in_close",
+        name="Check-in Closes",
+        icon="mdi:clock-end",
+        value_fn=lambda checkInInfo, _: checkInInfo["checkInClose"],
+    ),
+    RyanairSegmentTimeDescription(
+        key="departure",
+        name="Departure",
+        icon="mdi:airplane-takeoff",
+        value_fn=lambda _, flight: flight["depart"],
+    ),
+    RyanairSegmentTimeDescription(
+        key="arrival",
+        name="Arrival",
+        icon="mdi:airplane-landing",
+        value_fn=lambda _, flight: flight["arrive"],
+    ),
+)
+
+
+class RyanairSegmentTimeSensor(
+    CoordinatorEntity[RyanairFlightsCoordinator], SensorEntity
+):
+    """Ryanair segment timestamp sensor.
+
+    The frontend counts down to a timestamp by itself, and automations can
+    trigger on it directly, so the state only changes if the time does.
+    """
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+
+    def __init__(
+        self,
+        coordinator: RyanairFlightsCoordinator,
+        bookingRef: str,
+        checkInInfo: JsonObjectType,
+        flight: JsonObjectType,
+        description: RyanairSegmentTimeDescription,
+    ) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        segmentName = (
+            flight["flightNumber"]
+            + " ("
+            + flight["origin"]
+            + " - "
+            + flight["destination"]
+            + ")"
+        )
+        self.entity_description = description
+        self.bookingRef = bookingRef
+        self.segmentKey = (
+            flight["flightNumber"],
+            flight["origin"],
+            flight["destination"],
+        )
+        self._attr_name = segmentName + " " + description.name
+        self._attr_device_info = deviceInfo(bookingRef + " " + flight["flightNumber"])
+        self._attr_unique_id = f"Ryanair_{description.key}-{flight['flightNumber']}-{bookingRef}-{segmentName}".lower()
+        self._attr_native_value = parseUTC(description.value_fn(checkInInfo, flight))
+
+    def _segment(self) -> tuple[JsonObjectType, JsonObjectType] | None:
+        """Return (checkInInfo, segment) from the latest orders response."""
+        data = self.coordinator.data
+        if not isinstance(data, dict):
+            return None
+        for item in data.get("items", []):
+            if item["rawBooking"]["recordLocator"] != self.bookingRef:
+                continue
+            for _, checkInInfo, flight in iterSegments(
+                [parseItinerary(item["rawBooking"])]
+            ):
+                if (
+                    flight["flightNumber"],
+                    flight["origin"],
+                    flight["destination"],
+                ) == self.segmentKey:
+                    return checkInInfo, flight
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Follow schedule changes of the segment."""
+        # A segment gone from the orders keeps its last time until pruned.
+        if (segment := self._segment()) is not None:
+            self._attr_native_value = parseUTC(
+                self.entity_description.value_fn(*segment)
+            )
+        super()._handle_coordinator_update()
+
+
 class RyanairFlightSensor(CoordinatorEntity[RyanairFlightsCoordinator], SensorEntity):
     """Ryanair Check In Sensor."""
 
+    _unrecorded_attributes = frozenset({"passengers", "data_age"})
+
     def __init__(
         self,
         coordinator: RyanairFlightsCoordinator,
         bookingRef: str,
         checkInInfo: JsonObjectType,
         flight: JsonObjectType,
+        airports: AirportTable,
         description: SensorEntityDescription,
     ) -> None:
         """Initialize."""
         super().__init__(coordinator)
         self.flight = flight
+        self.airports = airports
 
         name = (
             self.flight["flightNumber"]
@@ -342,6 +507,7 @@ class RyanairFlightSensor(CoordinatorEntity[RyanairFlightsCoordinator], SensorEn
         )
         self._attr_unique_id = f"Ryanair_flight-{self.flight['flightNumber']}-{self.bookingRef}-{name}-{description.key}".lower()
         self._attrs: dict[str, Any] = {}
+        self._attrsKey: JsonObjectType | None = None
         self.entity_description = description
         self._state = None
         self._name = name
@@ -376,20 +542,42 @@ class RyanairFlightSensor(CoordinatorEntity[RyanairFlightsCoordinator], SensorEn
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Define entity states."""
-        attrs = {
-            "flightNumber": self.flight["flightNumber"],
-            "origin": self.flight["origin"],
-            "destination": self.flight["destination"],
-            "arrive": self.flight["arrive"],
-            "depart": self.flight["depart"],
-            "checkInOpen": self.checkInInfo["checkInOpen"],
-            "checkInClose": self.checkInInfo["checkInClose"],
-            "isCancelled": self.flight["isCancelled"],
-            "passengers": self.passengers,
-        }
-
-        self._attrs = attrs
-        return self._attrs
+        # Built once per segment rather than on every state write.
+        if self._attrsKey is not self.flight:
+            self._attrs = {
+                "flightNumber": self.flight["flightNumber"],
+                "origin": self.flight["origin"],
+                "destination": self.flight["destination"],
+                "arrive": self.flight["arrive"],
+                "depart": self.flight["depart"],
+                "checkInOpen": self.checkInInfo["checkInOpen"],
+                "checkInClose": self.checkInInfo["checkInClose"],
+                "isCancelled": self.flight["isCancelled"],
+                "passengers": self.passengers,
+            }
+            self._attrs.update(self._airportAttributes())
+            self._attrsKey = self.flight
+        # How old the data is, which only grows while the API is unreachable.
+        return {**self._attrs, "data_age": self.coordinator.dataAge}
+
+    def _airportAttributes(self) -> dict[str, Any]:
+        """Airport names and local times from the bundled airport table."""
+        attrs = {}
+        for key, field, time in (
+            ("origin", "origin", "depart"),
+            ("destination", "destination", "arrive"),
+        ):
+            airport = self.airports.get(self.flight[field])
+            if airport is None:
+                continue
+            attrs[key + "Name"] = airport.name
+            attrs[key + "City"] = airport.city
+            localTime = self.airports.localTime(
+                airport.iata, parseUTC(self.flight[time])
+            )
+            if localTime is not None:
+                attrs[time + "Local"] = localTime.isoformat()
+        return attrs
 
     async def async_update(self) -> None:
         """Update the entity.
@@ -397,27 +585,7 @@ class RyanairFlightSensor(CoordinatorEntity[RyanairFlightsCoordinator], SensorEn
         Only used by the generic entity update service.
         """
         try:
-            if self.checkInComplete:
-                state = "Checked-in"
-            else:
-                now_utc = dt_util.utcnow().timestamp()
-
-                checkInOpenUTC = datetime.strptime(
-                    self.flight["checkInOpen"], "%Y-%m-%dT%H:%M:%SZ"
-                ).timestamp()
-
-                checkInCloseUTC = datetime.strptime(
-                    self.flight["checkInClose"], "%Y-%m-%dT%H:%M:%SZ"
-                ).timestamp()
-
-                if now_utc < checkInOpenUTC:
-                    state = "Check-in not open"
-                elif now_utc >= checkInOpenUTC and now_utc <= checkInCloseUTC:
-                    state = "Check-in open"
-                else:
-                    state = "Check-in closed"
-
-            self._state = state
+            self._state = checkInState(self.checkInInfo, self.checkInComplete)
             self._available = True
         except ClientError:
             self._available = False
@@ -426,9 +594,111 @@ class RyanairFlightSensor(CoordinatorEntity[RyanairFlightsCoordinator], SensorEn
             )
 
 
+def checkInState(checkInInfo: JsonObjectType, checkInComplete: bool) -> str:
+    """Return the check-in state of a segment."""
+    if checkInComplete:
+        return "Checked-in"
+
+    now_utc = dt_util.utcnow().timestamp()
+    checkInOpenUTC = parseUTC(checkInInfo["checkInOpen"]).timestamp()
+    checkInCloseUTC = parseUTC(checkInInfo["checkInClose"]).timestamp()
+
+    if now_utc < checkInOpenUTC:
+        return "Check-in not open"
+    if now_utc <= checkInCloseUTC:
+        return "Check-in open"
+    return "Check-in closed"
+
+
+class RyanairBookingSensor(CoordinatorEntity[RyanairFlightsCoordinator], SensorEntity):
+    """All the flights of a booking, on a single device.
+
+    The state is the check-in state of the booking's next flight.
+    """
+
+    _attr_icon = "mdi:airplane-takeoff"
+    _unrecorded_attributes = frozenset({"segments", "passengers", "data_age"})
+
+    def __init__(self, coordinator: RyanairFlightsCoordinator, bookingRef: str) -> None:
+        """Initialize."""
+        super().__init__(coordinator)
+        self.bookingRef = bookingRef
+        self._attr_name = bookingRef
+        self._attr_device_info = deviceInfo(bookingRef)
+        self._attr_unique_id = f"Ryanair_booking-{bookingRef}".lower()
+        self._attrs: dict[str, Any] = {}
+        self._update()
+
+    def _itinerary(self) -> JsonObjectType | None:
+        """Return the booking from the latest orders response."""
+        data = self.coordinator.data
+        if not isinstance(data, dict):
+            return None
+        for item in data.get("items", []):
+            if item["rawBooking"]["recordLocator"] == self.bookingRef:
+                return parseItinerary(item["rawBooking"])
+        return None
+
+    def _update(self) -> None:
+        """Refresh the state and attributes from the coordinator data."""
+        itinerary = self._itinerary()
+        if itinerary is None:
+            self._attr_available = False
+            return
+
+        now_utc = dt_util.utcnow()
+        segments = []
+        passengers: list[str] = []
+        state = "Completed"
+        for _, checkInInfo, flight in iterSegments([itinerary]):
+            segments.append(
+                {
+                    "flightNumber": flight["flightNumber"],
+                    "origin": flight["origin"],
+                    "destination": flight["destination"],
+                    "depart": flight["depart"],
+                    "arrive": flight["arrive"],
+                    "isCancelled": flight["isCancelled"],
+                    "checkInComplete": flight["checkInComplete"],
+                }
+            )
+            for passenger in flight["passengers"]:
+                passengerName = passenger["firstName"] + " " + passenger["lastName"]
+                if passengerName not in passengers:
+                    passengers.append(passengerName)
+            if (
+                state == "Completed"
+                and not flight["isCancelled"]
+                and parseUTC(flight["depart"]) > now_utc
+            ):
+                state = checkInState(checkInInfo, flight["checkInComplete"])
+
+        self._attr_available = True
+        self._attr_native_value = state
+        self._attrs = {
+            "bookingRef": self.bookingRef,
+            "status": itinerary["status"],
+            "segments": segments,
+            "passengers": passengers,
+        }
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Define entity attributes."""
+        return {**self._attrs, "data_age": self.coordinator.dataAge}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update()
+        super()._handle_coordinator_update()
+
+
 class RyanairProfileSensor(CoordinatorEntity[RyanairProfileCoordinator], SensorEntity):
     """Define an Ryanair sensor."""
 
+    _unrecorded_attributes = frozenset(PROFILE_UNRECORDED_ATTRIBUTES)
+
     def __init__(
         self,
         coordinator: RyanairProfileCoordinator,
@@ -443,6 +713,7 @@ class RyanairProfileSensor(CoordinatorEntity[RyanairProfileCoordinator], SensorE
         self._attr_device_info = deviceInfo(name)
         self._attr_unique_id = f"Ryanair_{name}-{description.key}".lower()
         self._attrs: dict[str, Any] = {}
+        self._attrsKey: tuple[Any, ...] | None = None
         self.entity_description = description
         self._state = None
         self._name = name
@@ -486,11 +757,19 @@ class RyanairProfileSensor(CoordinatorEntity[RyanairProfileCoordinator], SensorE
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Define entity attributes."""
-        if self.coordinator.data is not None:
-            for key in self.coordinator.data:
-                self._attrs[key] = self.coordinator.data[key]
-            return self._attrs
-        return None
+        if self.coordinator.data is None:
+            return None
+
+        # Rebuilt only when one of the exposed profile fields changes.
+        attrsKey = tuple(self.coordinator.data.get(key) for key in PROFILE_ATTRIBUTES)
+        if attrsKey != self._attrsKey:
+            self._attrs = {
+                key: self.coordinator.data[key]
+                for key in PROFILE_ATTRIBUTES
+                if key in self.coordinator.data
+            }
+            self._attrsKey = attrsKey
+        return {**self._attrs, "data_age": self.coordinator.dataAge}
 
     async def async_update(self) -> None:
         """Update the entity.
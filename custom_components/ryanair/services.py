@@ -0,0 +1,86 @@
+"""Ryanair services."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from aiohttp import ClientError
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import (
+    ATTR_BOOKING_REFERENCE,
+    BOARDING_PASS_COORDINATOR,
+    BOOKING_DETAILS_COORDINATOR,
+    COORDINATORS,
+    DOMAIN,
+    FLIGHTS_COORDINATOR,
+    SERVICE_REFRESH_BOOKING,
+)
+from .errors import RyanairError
+
+REFRESH_BOOKING_SCHEMA = vol.Schema(
+    {vol.Required(ATTR_BOOKING_REFERENCE): vol.All(cv.string, vol.Upper)}
+)
+
+
+def _checkRefreshed(coordinator, bookingRef: str) -> None:
+    """Raise if a coordinator could not refresh a booking."""
+    if not coordinator.last_update_success or coordinator.offline:
+        raise HomeAssistantError(
+            f"Refreshing booking {bookingRef} failed: {coordinator.last_exception}"
+        )
+
+
+async def async_refresh_booking(coordinators: dict[str, Any], bookingRef: str) -> None:
+    """Refresh the orders item, details and boarding passes of one booking."""
+    try:
+        await coordinators[FLIGHTS_COORDINATOR].async_refresh_booking(bookingRef)
+    except (UpdateFailed, RyanairError, ClientError, TimeoutError) as err:
+        raise HomeAssistantError(
+            f"Refreshing booking {bookingRef} failed: {err}"
+        ) from err
+
+    # Passes are fetched with the contact email found in the details.
+    for key in (BOOKING_DETAILS_COORDINATOR, BOARDING_PASS_COORDINATOR):
+        await coordinators[key].async_refresh_booking(bookingRef)
+        _checkRefreshed(coordinators[key], bookingRef)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services."""
+
+    async def async_handle_refresh_booking(call: ServiceCall) -> None:
+        """Refresh the orders item, details and boarding passes of a booking.
+
+        Only this booking is fetched again, so it is cheap enough to call from
+        automations as often as needed, e.g. around check-in.
+        """
+        bookingRef = call.data[ATTR_BOOKING_REFERENCE]
+        accounts = [
+            coordinators
+            for coordinators in hass.data.get(DOMAIN, {}).get(COORDINATORS, {}).values()
+            if any(
+                item["rawBooking"]["recordLocator"] == bookingRef
+                for item in (coordinators[FLIGHTS_COORDINATOR].data or {}).get(
+                    "items", []
+                )
+            )
+        ]
+        if not accounts:
+            raise ServiceValidationError(f"No booking {bookingRef} found")
+
+        for coordinators in accounts:
+            await async_refresh_booking(coordinators, bookingRef)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_BOOKING,
+        async_handle_refresh_booking,
+        schema=REFRESH_BOOKING_SCHEMA,
+    )
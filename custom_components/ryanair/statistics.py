@@ -0,0 +1,141 @@
+"""Ryanair travel statistics."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonObjectType
+
+from .airports import AirportTable
+from .bookings import HISTORY_SEGMENT_FIELDS, compactBooking, parseUTC
+from .const import PRODUCT_ID
+
+DEPART = HISTORY_SEGMENT_FIELDS.index("depart")
+ARRIVE = HISTORY_SEGMENT_FIELDS.index("arrive")
+ORIGIN = HISTORY_SEGMENT_FIELDS.index("origin")
+DESTINATION = HISTORY_SEGMENT_FIELDS.index("destination")
+CANCELLED = HISTORY_SEGMENT_FIELDS.index("isCancelled")
+
+
+class TravelStatistics:
+    """Running totals over the flights an account has taken.
+
+    A segment is added to the totals once, when it has landed, and a booking
+    is skipped for good once all of its segments are accounted for. Each
+    update therefore only looks at bookings that still have flights ahead.
+
+    The totals are saved in the store, so they never go down when bookings
+    are dropped from it or the history is cleared, which the recorder would
+    take for a meter reset.
+    """
+
+    def __init__(self, airports: AirportTable, store) -> None:
+        """Initialize."""
+        self.airports = airports
+        self.store = store
+        self.flightsByYear: Counter[int] = Counter()
+        self.distance = 0.0
+        self.airTime = 0.0
+        self.visits: Counter[str] = Counter()
+        self._counted: set[tuple[str, int]] = set()
+        self._completed: set[str] = set()
+        self._historySize = 0
+        self._restore(store.statistics)
+
+    def _restore(self, saved: JsonObjectType) -> None:
+        """Pick up the totals saved by an earlier setup."""
+        # JSON turns the years into strings and the counted keys into lists.
+        self.flightsByYear = Counter(
+            {
+                int(year): flights
+                for year, flights in saved.get("flightsByYear", {}).items()
+            }
+        )
+        self.distance = saved.get("distance", 0.0)
+        self.airTime = saved.get("airTime", 0.0)
+        self.visits = Counter(saved.get("visits", {}))
+        self._counted = {tuple(key) for key in saved.get("counted", [])}
+        self._completed = set(saved.get("completed", []))
+
+    def _asDict(self) -> JsonObjectType:
+        """Return the totals to save."""
+        return {
+            "flightsByYear": dict(self.flightsByYear),
+            "distance": self.distance,
+            "airTime": self.airTime,
+            "visits": dict(self.visits),
+            "counted": sorted(self._counted),
+            "completed": sorted(self._completed),
+        }
+
+    @property
+    def flightsThisYear(self) -> int:
+        """Return the number of flights landed this year."""
+        return self.flightsByYear[dt_util.utcnow().year]
+
+    def mostVisited(self, count: int = 5) -> list[tuple[str, int]]:
+        """Return the most visited airports and their number of visits."""
+        return self.visits.most_common(count)
+
+    @callback
+    def async_update(self, data: Any) -> None:
+        """Add the segments that have landed since the last update."""
+        changed = False
+        if len(self.store.history) != self._historySize:
+            for productId, booking in list(self.store.history.items()):
+                changed |= self._addBooking(productId, booking["segments"])
+            self._historySize = len(self.store.history)
+
+        items = (data or {}).get("items", []) if isinstance(data, dict) else []
+        for item in (*self.store.bookings.values(), *items):
+            if item[PRODUCT_ID] not in self._completed:
+                changed |= self._addBooking(
+                    item[PRODUCT_ID], compactBooking(item["rawBooking"])["segments"]
+                )
+
+        if changed:
+            self.store.async_save_statistics(self._asDict())
+
+    def _addBooking(self, productId: str, segments: list[list[Any]]) -> bool:
+        """Add the landed segments of a booking not counted yet.
+
+        Returns True if the totals changed.
+        """
+        if productId in self._completed:
+            return False
+
+        now = dt_util.utcnow()
+        changed = False
+        completed = True
+        for index, segment in enumerate(segments):
+            if segment[CANCELLED]:
+                continue
+
+            arrive = parseUTC(segment[ARRIVE])
+            if arrive > now:
+                completed = False
+                continue
+
+            key = (productId, index)
+            if key in self._counted:
+                continue
+            self._counted.add(key)
+            changed = True
+
+            self.flightsByYear[arrive.year] += 1
+            self.airTime += (arrive - parseUTC(segment[DEPART])).total_seconds() / 3600
+            self.visits[segment[DESTINATION]] += 1
+            self.distance += (
+                self.airports.distance(segment[ORIGIN], segment[DESTINATION]) or 0.0
+            )
+
+        if completed:
+            self._completed.add(productId)
+            self._counted.difference_update(
+                (productId, index) for index in range(len(segments))
+            )
+            changed = True
+        return changed
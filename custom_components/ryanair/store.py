@@ -0,0 +1,187 @@
+"""Persistent storage of Ryanair bookings that can no longer change."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonObjectType
+
+from .bookings import compactBooking, isFrozen
+from .const import DOMAIN, PRODUCT_ID
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class RyanairBookingStore:
+    """Frozen bookings of one account, kept across restarts.
+
+    A booking is frozen once every segment has landed or been cancelled. From
+    then on nothing about it changes, so its orders item and boarding passes
+    are served from here and its details and passes are never requested again.
+
+    With history enabled, every booking that has completed is also kept in
+    compact form, along with when the past orders were last synced.
+
+    The running totals of the travel statistics are kept here too.
+    """
+
+    def __init__(self, hass: HomeAssistant, fingerprint: str) -> None:
+        """Initialize."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{fingerprint}"
+        )
+        # productId -> projected orders item
+        self.bookings: dict[str, JsonObjectType] = {}
+        # recordLocator -> boarding passes, without their barcodes
+        self.boardingPasses: dict[str, list[JsonObjectType]] = {}
+        self.keepHistory = False
+        # productId -> compact booking, see compactBooking()
+        self.history: dict[str, JsonObjectType] = {}
+        # When the past orders were last synced, None until backfilled.
+        self.synced: str | None = None
+        # Travel statistics totals, see TravelStatistics
+        self.statistics: JsonObjectType = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        """Load the frozen bookings from disk."""
+        data = await self._store.async_load() or {}
+        self.bookings = data.get("bookings", {})
+        self.boardingPasses = data.get("boardingPasses", {})
+        self.history = data.get("history", {})
+        self.synced = data.get("synced")
+        self.statistics = data.get("statistics", {})
+
+    async def async_unload(self) -> None:
+        """Write out any save still pending."""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the stored bookings."""
+        await self._store.async_remove()
+
+    def isFrozen(self, productId: str) -> bool:
+        """Return True if a booking is frozen."""
+        return productId in self.bookings
+
+    @callback
+    def async_merge(self, body: Any) -> Any:
+        """Swap the frozen bookings of an orders response for their stored copy.
+
+        Bookings that have just become frozen are stored first. Serving the
+        stored object keeps it identical between cycles, so nothing derived
+        from it has to be rebuilt.
+        """
+        if not isinstance(body, dict) or "items" not in body:
+            return body
+
+        items = []
+        for item in body["items"]:
+            productId = item[PRODUCT_ID]
+            if productId not in self.bookings and isFrozen(item["rawBooking"]):
+                self.bookings[productId] = item
+                if self.keepHistory:
+                    self.history.setdefault(
+                        productId, compactBooking(item["rawBooking"])
+                    )
+                self._async_schedule_save()
+            items.append(self.bookings.get(productId, item))
+
+        body["items"] = items
+        return body
+
+    @callback
+    def async_add_history(self, items: list[JsonObjectType]) -> int:
+        """Add past orders to the history and record when they were synced.
+
+        Orders already in the history are skipped without being processed.
+        Every other order is checked, as orders complete in the order their
+        flights land, not the order they were booked in. Returns the number of
+        orders added.
+        """
+        added = 0
+        for item in items:
+            if item[PRODUCT_ID] in self.history:
+                continue
+            self.history[item[PRODUCT_ID]] = compactBooking(item["rawBooking"])
+            added += 1
+
+        self.synced = dt_util.utcnow().isoformat()
+        self._async_schedule_save()
+        return added
+
+    @callback
+    def async_evict(self, productIds: list[str]) -> list[JsonObjectType]:
+        """Drop frozen bookings and their boarding passes.
+
+        With history enabled, each booking is kept there in compact form.
+        Returns the boarding passes dropped.
+        """
+        boardingPasses = []
+        for productId in productIds:
+            item = self.bookings.pop(productId)
+            if self.keepHistory:
+                self.history.setdefault(productId, compactBooking(item["rawBooking"]))
+            boardingPasses.extend(
+                self.boardingPasses.pop(item["rawBooking"]["recordLocator"], [])
+            )
+        if productIds:
+            self._async_schedule_save()
+        return boardingPasses
+
+    @callback
+    def async_save_statistics(self, statistics: JsonObjectType) -> None:
+        """Keep the running totals of the travel statistics."""
+        self.statistics = statistics
+        self._async_schedule_save()
+
+    @callback
+    def async_clear_history(self) -> None:
+        """Forget the history and when it was synced."""
+        if self.history or self.synced is not None:
+            self.history = {}
+            self.synced = None
+            self._async_schedule_save()
+
+    @callback
+    def async_boarding_passes(
+        self, recordLocator: str, previous: list[JsonObjectType] | None
+    ) -> list[JsonObjectType]:
+        """Return the boarding passes of a frozen booking.
+
+        The passes last fetched while the booking was active are stored the
+        first time they are asked for. Their flights have landed, so the
+        barcodes are dropped.
+        """
+        if recordLocator not in self.boardingPasses:
+            self.boardingPasses[recordLocator] = [
+                {key: value for key, value in boardingPass.items() if key != "barcode"}
+                for boardingPass in previous or []
+                if boardingPass.get("pnr") == recordLocator
+            ]
+            self._async_schedule_save()
+
+        return self.boardingPasses[recordLocator]
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Save the store after a short delay."""
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to write to disk."""
+        self._dirty = False
+        return {
+            "bookings": self.bookings,
+            "boardingPasses": self.boardingPasses,
+            "history": self.history,
+            "synced": self.synced,
+            "statistics": self.statistics,
+        }
@@ -0,0 +1,246 @@
+"""Ryanair websocket API."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import CONF_EMAIL
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util.json import JsonObjectType
+
+from .bookings import parseItineraries
+from .const import (
+    ARCHIVER,
+    COORDINATORS,
+    DOMAIN,
+    FLIGHTS_COORDINATOR,
+    SIGNAL_ACCOUNTS_CHANGED,
+)
+from .sensor import generate_device_fingerprint
+
+ENTRY_ID = "entry_id"
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_itinerary)
+    websocket_api.async_register_command(hass, websocket_subscribe_itinerary)
+
+
+def loadedAccounts(
+    hass: HomeAssistant, entryId: str | None
+) -> dict[str, dict[str, Any]]:
+    """Return the coordinators of every loaded account, by config entry id."""
+    coordinators = hass.data.get(DOMAIN, {}).get(COORDINATORS, {})
+    accounts = {}
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entryId is not None and entry.entry_id != entryId:
+            continue
+        fingerprint = generate_device_fingerprint(entry.data[CONF_EMAIL])
+        if fingerprint in coordinators:
+            accounts[entry.entry_id] = coordinators[fingerprint]
+    return accounts
+
+
+def accountItineraries(coordinators: dict[str, Any]) -> dict[str, JsonObjectType]:
+    """Return the normalised bookings of an account, by booking reference."""
+    data = coordinators[ARCHIVER].currentBookings(
+        coordinators[FLIGHTS_COORDINATOR].data
+    )
+    return {itinerary["bookingRef"]: itinerary for itinerary in parseItineraries(data)}
+
+
+def _accountState(coordinators: dict[str, Any]) -> JsonObjectType:
+    """Return how fresh an account's data is."""
+    flightsCoordinator = coordinators[FLIGHTS_COORDINATOR]
+    return {
+        "offline": flightsCoordinator.offline,
+        "data_age": flightsCoordinator.dataAge,
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ryanair/itinerary",
+        vol.Optional(ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_itinerary(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the bookings of one or every account.
+
+    Each booking comes with its journeys, their segments, passengers and
+    check-in state, as also used by the sensors.
+    """
+    accounts = loadedAccounts(hass, msg.get(ENTRY_ID))
+    if ENTRY_ID in msg and not accounts:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Account not loaded"
+        )
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "accounts": {
+                entryId: {
+                    **_accountState(coordinators),
+                    "bookings": list(accountItineraries(coordinators).values()),
+                }
+                for entryId, coordinators in accounts.items()
+            }
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "ryanair/itinerary/subscribe",
+        vol.Optional(ENTRY_ID): str,
+    }
+)
+@callback
+def websocket_subscribe_itinerary(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the bookings of one or every account, then what changes.
+
+    The first event holds every booking. Each later one only holds the
+    bookings that changed and the references of those that went away. An
+    account unloaded since has all its bookings removed, and one loaded or
+    reloaded since has them all sent again as changed.
+    """
+    entryIdFilter = msg.get(ENTRY_ID)
+    accounts = loadedAccounts(hass, entryIdFilter)
+    if ENTRY_ID in msg and not accounts:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Account not loaded"
+        )
+        return
+
+    # entry id -> (coordinators, bookings last sent, listener removal)
+    tracked: dict[
+        str, tuple[dict[str, Any], dict[str, JsonObjectType], CALLBACK_TYPE]
+    ] = {}
+
+    @callback
+    def async_send_changes(
+        entryId: str,
+        coordinators: dict[str, Any],
+        previous: dict[str, JsonObjectType],
+        itineraries: dict[str, JsonObjectType],
+    ) -> None:
+        changed = [
+            itinerary
+            for bookingRef, itinerary in itineraries.items()
+            if previous.get(bookingRef) != itinerary
+        ]
+        removed = [
+            bookingRef for bookingRef in previous if bookingRef not in itineraries
+        ]
+        if not changed and not removed:
+            return
+
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "accounts": {
+                        entryId: {
+                            **_accountState(coordinators),
+                            "changed": changed,
+                            "removed": removed,
+                        }
+                    }
+                },
+            )
+        )
+
+    @callback
+    def async_forward_changes(entryId: str) -> None:
+        coordinators, previous, unsub = tracked[entryId]
+        itineraries = accountItineraries(coordinators)
+        tracked[entryId] = (coordinators, itineraries, unsub)
+        async_send_changes(entryId, coordinators, previous, itineraries)
+
+    @callback
+    def async_track(
+        entryId: str, coordinators: dict[str, Any]
+    ) -> dict[str, JsonObjectType]:
+        itineraries = accountItineraries(coordinators)
+        tracked[entryId] = (
+            coordinators,
+            itineraries,
+            coordinators[FLIGHTS_COORDINATOR].async_add_listener(
+                partial(async_forward_changes, entryId)
+            ),
+        )
+        return itineraries
+
+    @callback
+    def async_accounts_changed() -> None:
+        # Coordinators are replaced on every reload, so the listeners follow.
+        current = loadedAccounts(hass, entryIdFilter)
+        for entryId, (coordinators, previous, unsub) in list(tracked.items()):
+            if current.get(entryId) is coordinators:
+                continue
+            unsub()
+            del tracked[entryId]
+            if entryId in current:
+                async_send_changes(
+                    entryId,
+                    current[entryId],
+                    previous,
+                    async_track(entryId, current[entryId]),
+                )
+            else:
+                async_send_changes(entryId, coordinators, previous, {})
+
+        for entryId in current.keys() - tracked.keys():
+            async_send_changes(
+                entryId, current[entryId], {}, async_track(entryId, current[entryId])
+            )
+
+    sent = {
+        entryId: async_track(entryId, coordinators)
+        for entryId, coordinators in accounts.items()
+    }
+    unsubAccounts = async_dispatcher_connect(
+        hass, SIGNAL_ACCOUNTS_CHANGED, async_accounts_changed
+    )
+
+    @callback
+    def async_unsubscribe() -> None:
+        unsubAccounts()
+        for _, _, unsub in tracked.values():
+            unsub()
+        tracked.clear()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "accounts": {
+                    entryId: {
+                        **_accountState(accounts[entryId]),
+                        "bookings": list(itineraries.values()),
+                    }
+                    for entryId, itineraries in sent.items()
+                }
+            },
+        )
+    )
@@ -0,0 +1,70 @@
+"""Build the airport table bundled with the integration.
+
+Reads the airports.csv of the airportsdata project
+(https://github.com/mborsetti/airportsdata, MIT licensed) and writes every
+airport with an IATA code to custom_components/ryanair/airports.bin, in the
+record format read by custom_components/ryanair/airports.py.
+
+    pip download airportsdata --no-deps && unzip airportsdata-*.whl
+    python scripts/build_airports.py airportsdata/airports.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from pathlib import Path
+import struct
+
+# Keep in step with custom_components/ryanair/airports.py.
+MAGIC = b"IATA"
+HEADER = struct.Struct("<4sI")
+RECORD = struct.Struct("<3sffIII")
+OUTPUT = Path(__file__).parent.parent / "custom_components" / "ryanair" / "airports.bin"
+
+
+def main() -> None:
+    """Build the table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", type=Path, help="airportsdata airports.csv")
+    parser.add_argument("--output", type=Path, default=OUTPUT)
+    args = parser.parse_args()
+
+    airports = {}
+    with args.csv.open(encoding="UTF-8", newline="") as file:
+        for row in csv.DictReader(file):
+            iata = row["iata"].strip().upper()
+            if len(iata) == 3 and iata.isascii() and iata not in airports:
+                airports[iata] = row
+
+    # Names, cities and time zones are stored once each, NUL terminated, after
+    # the records, which refer to them by offset.
+    strings = bytearray()
+    offsets: dict[str, int] = {}
+
+    def offset(value: str) -> int:
+        if value not in offsets:
+            offsets[value] = len(strings)
+            strings.extend(value.encode("UTF-8") + b"\0")
+        return offsets[value]
+
+    records = b"".join(
+        RECORD.pack(
+            iata.encode("ascii"),
+            float(airports[iata]["lat"]),
+            float(airports[iata]["lon"]),
+            offset(airports[iata]["name"]),
+            offset(airports[iata]["city"]),
+            offset(airports[iata]["tz"]),
+        )
+        for iata in sorted(airports)
+    )
+
+    args.output.write_bytes(
+        HEADER.pack(MAGIC, len(airports)) + records + bytes(strings)
+    )
+    print(f"Wrote {len(airports)} airports to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""Local stand-in for the Ryanair API used by the integration.
+
+Serves the endpoints the coordinators call (accountLogin, rememberMeToken,
+rememberMe, orders details, customer profile, boardingpass and
+getbookingbybookingid) with synthetic data, so the integration can be soak
+and load tested offline. Point Home Assistant at it with:
+
+    ryanair:
+      base_url: http://127.0.0.1:8099
+
+Request counts per endpoint are available from GET /_stats.
+
+    python scripts/mock_api.py --bookings 50 --passengers 4 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+import hashlib
+import random
+import secrets
+import time
+
+from aiohttp import web
+
+NOT_AUTHENTICATED = {
+    "access-denied": True,
+    "message": "Full authentication is required to access this resource.",
+    "cause": "NOT AUTHENTICATED",
+}
+AIRPORTS = ["DUB", "STN", "BGY", "CRL", "MAD", "BCN", "KRK", "LIS", "OPO", "BVA"]
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def utc(value: datetime) -> str:
+    """Format a datetime the way the Ryanair API does."""
+    return value.strftime(DATE_FORMAT)
+
+
+def buildBooking(
+    index: int, passengers: int, padding: int, days: tuple[int, int] = (-30, 60)
+) -> dict:
+    """Build one synthetic orders item shaped like the real API."""
+    rng = random.Random(index)
+    depart = datetime.now(UTC).replace(microsecond=0) + timedelta(
+        days=rng.randint(*days), hours=rng.randint(0, 23)
+    )
+    origin, destination = rng.sample(AIRPORTS, 2)
+    recordLocator = f"MK{index:04d}"
+
+    flights = []
+    seats = []
+    checkins = []
+    for journeyNum, (fromCode, toCode, departUTC) in enumerate(
+        [(origin, destination, depart), (destination, origin, depart + timedelta(7))]
+    ):
+        flights.append(
+            {
+                "journeyNum": journeyNum,
+                "checkInOpenUTC": utc(departUTC - timedelta(days=2)),
+                "checkInCloseUTC": utc(departUTC - timedelta(hours=2)),
+                "segments": [
+                    {
+                        "segmentNum": 0,
+                        "origin": fromCode,
+                        "destination": toCode,
+                        "flightNumber": f"FR{rng.randint(100, 9999)}",
+                        "isCancelled": False,
+                        "times": {
+                            "departUTC": utc(departUTC),
+                            "arriveUTC": utc(departUTC + timedelta(hours=2)),
+                        },
+                    }
+                ],
+            }
+        )
+        for paxNum in range(passengers):
+            seats.append(
+                {
+                    "journeyNum": journeyNum,
+                    "segmentNum": 0,
+                    "paxNum": paxNum,
+                    "code": f"{rng.randint(1, 33)}{rng.choice('ABCDEF')}",
+                }
+            )
+            if rng.random() < 0.5:
+                checkins.append(
+                    {"journeyNum": journeyNum, "paxNum": paxNum, "status": "checkin"}
+                )
+
+    return {
+        "productId": f"{index:08d}",
+        "rawBooking": {
+            "recordLocator": recordLocator,
+            "status": "Active",
+            "flights": flights,
+            "seats": seats,
+            "checkins": checkins,
+            "passengers": [
+                {
+                    "paxNum": paxNum,
+                    "title": "MR",
+                    "firstName": f"First{paxNum}",
+                    "middleName": "",
+                    "lastName": f"Last{index}",
+                }
+                for paxNum in range(passengers)
+            ],
+            # Stand-in for the many fields of a real booking we never read.
+            "extras": "x" * padding,
+        },
+    }
+
+
+class MockRyanairApi:
+    """In-memory Ryanair API."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize."""
+        self.args = args
+        self.requestCounts: Counter[str] = Counter()
+        self.tokens: dict[str, float] = {}
+        self.ordersBody = {
+            "items": [
+                buildBooking(index, args.passengers, args.padding)
+                for index in range(args.bookings)
+            ]
+        }
+        # Past orders, served for active=false, follow on from the active ones.
+        self.historyBody = {
+            "items": [
+                buildBooking(index, args.passengers, args.padding, (-1000, -10))
+                for index in range(args.bookings, args.bookings + args.history)
+            ]
+        }
+
+    def issueToken(self) -> str:
+        """Issue an auth token that expires after the configured lifetime."""
+        token = secrets.token_hex(16)
+        self.tokens[token] = time.monotonic() + self.args.token_ttl
+        return token
+
+    def authenticated(self, request: web.Request) -> bool:
+        """Return True if the request carries a live auth token."""
+        expires = self.tokens.get(request.headers.get("X-AUTH-TOKEN", ""))
+        return expires is not None and expires > time.monotonic()
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Count requests and inject latency and errors."""
+        if request.path == "/_stats":
+            return await handler(request)
+
+        self.requestCounts[request.match_info.route.name or request.path] += 1
+
+        if self.args.latency:
+            await asyncio.sleep(random.uniform(0, 2 * self.args.latency))
+        if random.random() < self.args.rate_429:
+            return web.json_response(
+                {"message": "API rate limit exceeded."}, status=429
+            )
+        if random.random() < self.args.rate_401:
+            return web.json_response(NOT_AUTHENTICATED, status=401)
+
+        return await handler(request)
+
+    async def accountLogin(self, request: web.Request) -> web.Response:
+        """POST usrprof/v2/accountLogin and the MFA verification."""
+        return web.json_response(
+            {"customerId": "mock-customer", "token": self.issueToken()}
+        )
+
+    async def rememberMeToken(self, request: web.Request) -> web.Response:
+        """GET usrprof/v2/accounts/{customerId}/rememberMeToken."""
+        if not self.authenticated(request):
+            return web.json_response(NOT_AUTHENTICATED, status=401)
+        return web.json_response({"token": secrets.token_hex(16)})
+
+    async def rememberMe(self, request: web.Request) -> web.Response:
+        """GET usrprof/v2/accounts/rememberMe."""
+        return web.json_response({"token": self.issueToken()})
+
+    async def orders(self, request: web.Request) -> web.Response:
+        """GET orders/v2/orders/{customerId}/details."""
+        if not self.authenticated(request):
+            return web.json_response(NOT_AUTHENTICATED, status=401)
+        if request.query.get("active") == "false":
+            return web.json_response(self.historyBody)
+        return web.json_response(self.ordersBody)
+
+    async def profile(self, request: web.Request) -> web.Response:
+        """GET usrprof/v2/customers/{customerId}/profile."""
+        if not self.authenticated(request):
+            return web.json_response(NOT_AUTHENTICATED, status=401)
+        return web.json_response(
+            {
+                "email": "mock@example.com",
+                "firstName": "Mock",
+                "lastName": "User",
+                "customerId": request.match_info["customerId"],
+            }
+        )
+
+    async def boardingPass(self, request: web.Request) -> web.Response:
+        """POST v1/boardingpass."""
+        if not self.authenticated(request):
+            return web.json_response(NOT_AUTHENTICATED, status=401)
+
+        body = await request.json()
+        passes = []
+        for item in self.ordersBody["items"]:
+            booking = item["rawBooking"]
+            if booking["recordLocator"] != body.get("RecordLocator"):
+                continue
+            for flight in booking["flights"]:
+                segment = flight["segments"][0]
+                for passenger in booking["passengers"]:
+                    passes.append(
+                        {
+                            "pnr": booking["recordLocator"],
+                            "paxType": "ADT",
+                            # Stable across requests, as the real barcodes are.
+                            "barcode": hashlib.sha512(
+                                f"{booking['recordLocator']}{flight['journeyNum']}"
+                                f"{passenger['paxNum']}".encode()
+                            ).hexdigest(),
+                            "flight": {
+                                "label": segment["flightNumber"],
+                                "carrierCode": "FR",
+                                "number": segment["flightNumber"][2:],
+                            },
+                            "departure": {
+                                "name": segment["origin"],
+                                "dateUTC": segment["times"]["departUTC"],
+                            },
+                            "arrival": {"name": segment["destination"]},
+                            "seat": {"designator": "1A"},
+                            "name": {
+                                "first": passenger["firstName"],
+                                "last": passenger["lastName"],
+                            },
+                        }
+                    )
+        return web.json_response(passes)
+
+    async def bookingDetails(self, request: web.Request) -> web.Response:
+        """POST booking/rest/en-IE/query/getbookingbybookingid."""
+        if not self.authenticated(request):
+            return web.json_response(NOT_AUTHENTICATED, status=401)
+
+        body = await request.json()
+        return web.json_response(
+            {
+                "bookingId": body["bookingInfo"]["bookingId"],
+                "contacts": [{"email": "mock@example.com"}],
+            }
+        )
+
+    async def stats(self, request: web.Request) -> web.Response:
+        """GET _stats."""
+        return web.json_response(dict(self.requestCounts))
+
+    def application(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_post(
+            "/usrprof/v2/accountLogin", self.accountLogin, name="accountLogin"
+        )
+        app.router.add_put(
+            "/usrprof/v2/accountVerifications/deviceFingerprint",
+            self.accountLogin,
+            name="deviceFingerprint",
+        )
+        app.router.add_get(
+            "/usrprof/v2/accounts/rememberMe", self.rememberMe, name="rememberMe"
+        )
+        app.router.add_get(
+            "/usrprof/v2/accounts/{customerId}/rememberMeToken",
+            self.rememberMeToken,
+            name="rememberMeToken",
+        )
+        app.router.add_get(
+            "/usrprof/v2/customers/{customerId}/profile", self.profile, name="profile"
+        )
+        app.router.add_get(
+            "/orders/v2/orders/{customerId}/details", self.orders, name="orders"
+        )
+        app.router.add_post("/v1/boardingpass", self.boardingPass, name="boardingpass")
+        app.router.add_post(
+            "/booking/rest/en-IE/query/getbookingbybookingid",
+            self.bookingDetails,
+            name="getbookingbybookingid",
+        )
+        app.router.add_get("/_stats", self.stats)
+        return app
+
+
+def main() -> None:
+    """Run the mock API."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="mean latency in seconds"
+    )
+    parser.add_argument(
+        "--token-ttl", type=float, default=3600, help="auth token lifetime in seconds"
+    )
+    parser.add_argument(
+        "--rate-401", type=float, default=0.0, help="fraction of requests given 401"
+    )
+    parser.add_argument(
+        "--rate-429", type=float, default=0.0, help="fraction of requests given 429"
+    )
+    parser.add_argument("--bookings", type=int, default=5)
+    parser.add_argument(
+        "--history", type=int, default=0, help="past orders served for active=false"
+    )
+    parser.add_argument("--passengers", type=int, default=2)
+    parser.add_argument(
+        "--padding", type=int, default=0, help="unused bytes added to each booking"
+    )
+    args = parser.parse_args()
+
+    web.run_app(MockRyanairApi(args).application(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
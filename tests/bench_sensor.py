@@ -0,0 +1,171 @@
+"""Benchmarks of the sensor platform setup and boarding pass rendering.
+
+Run with ``pytest tests/bench_sensor.py``. Besides the timings, each setup
+benchmark records the entities created and the peak memory allocated, and
+the rendering benchmark the boarding passes rendered per second, in the
+``extra_info`` of its results.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import secrets
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.ryanair import sensor
+from custom_components.ryanair.airports import async_get_airports
+from custom_components.ryanair.bookings import iterSegments, parseItineraries
+from custom_components.ryanair.const import (
+    ARCHIVER,
+    BOOKING_STORE,
+    COORDINATORS,
+    DEFAULT_ARCHIVE_DAYS,
+    DOMAIN,
+    FLIGHTS_COORDINATOR,
+    PROFILE_COORDINATOR,
+)
+from custom_components.ryanair.coordinator import (
+    RyanairFlightsCoordinator,
+    RyanairProfileCoordinator,
+    renderBoardingPasses,
+)
+from custom_components.ryanair.lifecycle import RyanairArchiver
+from custom_components.ryanair.store import RyanairBookingStore
+from scripts.mock_api import buildBooking
+
+from .conftest import EMAIL, FINGERPRINT
+
+# (bookings, passengers per booking)
+ACCOUNT_SIZES = [(1, 1), (50, 1), (50, 9), (500, 1), (500, 9)]
+
+
+@pytest.fixture
+async def account(
+    hass: HomeAssistant, config: dict[str, Any], request: pytest.FixtureRequest
+) -> RyanairArchiver:
+    """Load an account with bookings built like the mock API's.
+
+    The coordinators are given their data directly, so only the platform
+    setup is measured, not fetching.
+    """
+    bookings, passengers = request.param
+    entry = MockConfigEntry(domain=DOMAIN, data=config, version=2)
+    entry.add_to_hass(hass)
+
+    store = RyanairBookingStore(hass, FINGERPRINT)
+    profileCoordinator = RyanairProfileCoordinator(hass, None, config, FINGERPRINT)
+    profileCoordinator.data = {
+        "email": EMAIL,
+        "firstName": "Mock",
+        "lastName": "User",
+    }
+    flightsCoordinator = RyanairFlightsCoordinator(
+        hass, None, config, FINGERPRINT, store
+    )
+    flightsCoordinator.data = {
+        "items": [buildBooking(index, passengers, 0) for index in range(bookings)]
+    }
+    archiver = RyanairArchiver(
+        hass,
+        entry,
+        store,
+        flightsCoordinator,
+        timedelta(days=DEFAULT_ARCHIVE_DAYS),
+    )
+
+    hass.data.setdefault(DOMAIN, {})[COORDINATORS] = {
+        FINGERPRINT: {
+            PROFILE_COORDINATOR: profileCoordinator,
+            FLIGHTS_COORDINATOR: flightsCoordinator,
+            BOOKING_STORE: store,
+            ARCHIVER: archiver,
+        }
+    }
+    # The airport table is loaded once per Home Assistant, not per setup.
+    await async_get_airports(hass)
+    return archiver
+
+
+def expectedEntities(archiver: RyanairArchiver) -> int:
+    """Return the sensors an account should get."""
+    segments = list(
+        iterSegments(
+            parseItineraries(archiver.currentBookings(archiver.flightsCoordinator.data))
+        )
+    )
+    # A flight sensor and the timestamp sensors per segment, then the profile,
+    # upcoming flights and statistics sensors.
+    return (
+        len(segments) * (1 + len(sensor.SEGMENT_TIME_DESCRIPTIONS))
+        + 2
+        + len(sensor.STATISTIC_DESCRIPTIONS)
+    )
+
+
+@pytest.mark.parametrize(
+    "account",
+    ACCOUNT_SIZES,
+    indirect=True,
+    ids=[f"{bookings}x{passengers}" for bookings, passengers in ACCOUNT_SIZES],
+)
+def test_sensor_setup(
+    hass: HomeAssistant,
+    config: dict[str, Any],
+    account: RyanairArchiver,
+    benchmark,
+) -> None:
+    """Time the sensor platform setup, and record its entities and memory."""
+
+    def setup() -> list:
+        entities: list = []
+        hass.loop.run_until_complete(
+            sensor.async_setup_platform(
+                hass, config, lambda new, **_: entities.extend(new)
+            )
+        )
+        return entities
+
+    tracemalloc.start()
+    try:
+        entities = setup()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert len(entities) == expectedEntities(account)
+
+    benchmark.extra_info["entities"] = len(entities)
+    benchmark.extra_info["peak_kib"] = peak // 1024
+    benchmark.pedantic(setup, rounds=5, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("passengers", [1, 9])
+def test_boarding_pass_render(benchmark, tmp_path, passengers: int) -> None:
+    """Time rendering the barcodes of a booking's boarding passes.
+
+    A booking has a pass per passenger for each of its two journeys, rendered
+    with the boarding pass coordinator's renderBoardingPasses.
+    """
+    barcodes = {
+        tmp_path / f"{index}.png": secrets.token_hex(64)
+        for index in range(2 * passengers)
+    }
+
+    def render() -> None:
+        renderBoardingPasses(barcodes)
+
+    # Timed here too, as the benchmark keeps no stats when it is disabled.
+    start = time.perf_counter()
+    benchmark.pedantic(render, rounds=5, warmup_rounds=1)
+    if benchmark.enabled:
+        elapsed = benchmark.stats.stats.mean
+    else:
+        elapsed = time.perf_counter() - start
+    benchmark.extra_info["passes_per_second"] = round(len(barcodes) / elapsed, 1)
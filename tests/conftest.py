@@ -0,0 +1,75 @@
+"""Fixtures for the Ryanair tests."""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+import pytest
+
+from custom_components.ryanair import bookings
+from custom_components.ryanair.const import (
+    CONF_DEVICE_FINGERPRINT,
+    CUSTOMER_ID,
+    CUSTOMERS,
+    TOKEN,
+)
+from custom_components.ryanair.sensor import generate_device_fingerprint
+from scripts.mock_api import MockRyanairApi
+
+EMAIL = "mock@example.com"
+FINGERPRINT = generate_device_fingerprint(EMAIL)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components."""
+
+
+@pytest.fixture(autouse=True)
+def boarding_passes_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Render boarding passes into a temporary directory, not the package."""
+    monkeypatch.setattr(bookings, "BOARDING_PASSES_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def config() -> dict[str, Any]:
+    """Return the data of a config entry for the mock account."""
+    return {
+        "email": EMAIL,
+        "password": "password",
+        CUSTOMERS: {
+            FINGERPRINT: {
+                CONF_DEVICE_FINGERPRINT: FINGERPRINT,
+                CUSTOMER_ID: "mock-customer",
+                TOKEN: "expired-token",
+            }
+        },
+    }
+
+
+@pytest.fixture
+async def mock_api(socket_enabled: None) -> AsyncGenerator[str, None]:
+    """Serve scripts/mock_api.py on a free local port and return its URL."""
+    api = MockRyanairApi(
+        argparse.Namespace(
+            latency=0.0,
+            token_ttl=3600,
+            rate_401=0.0,
+            rate_429=0.0,
+            bookings=2,
+            history=2,
+            passengers=1,
+            padding=0,
+        )
+    )
+    runner = web.AppRunner(api.application())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    await runner.cleanup()
@@ -0,0 +1,118 @@
+"""Test that reloading an entry releases everything it held."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+import gc
+import os
+from pathlib import Path
+import tracemalloc
+from typing import Any, NamedTuple
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.ryanair.const import CONF_BASE_URL, CONF_HISTORY, DOMAIN
+
+RELOADS = 200
+# Reloads before measuring, so caches filled once per process are not counted.
+WARM_UP_RELOADS = 10
+# Memory allowed to grow over every reload, well under a single booking store.
+# The test harness keeps every Store it loads, a few hundred bytes a reload.
+MEMORY_SLACK = 256 * 1024
+FD_DIR = Path("/proc/self/fd")
+# Only memory allocated by the integration itself is compared, as the test
+# harness keeps log records and mock calls, and Home Assistant keeps unloaded
+# entity platforms. Objects of the integration kept alive are counted instead.
+TRACED_FILES = str(Path(__file__).parents[1] / "custom_components" / "*")
+
+
+class Resources(NamedTuple):
+    """What an entry could leak."""
+
+    tasks: int
+    sockets: int | None
+    objects: Counter[str]
+    memory: tracemalloc.Snapshot
+
+
+def resources() -> Resources:
+    """Measure the tasks and sockets open, and what the integration holds."""
+    gc.collect()
+    sockets = None
+    if FD_DIR.is_dir():
+        sockets = 0
+        for fd in os.listdir(FD_DIR):
+            try:
+                sockets += os.readlink(FD_DIR / fd).startswith("socket:")
+            except OSError:
+                continue
+    objects = Counter(
+        type(obj).__qualname__
+        for obj in gc.get_objects()
+        if str(type(obj).__module__).startswith("custom_components.ryanair")
+    )
+    memory = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(True, TRACED_FILES)]
+    )
+    return Resources(len(asyncio.all_tasks()), sockets, objects, memory)
+
+
+@pytest.mark.timeout(600)
+async def test_reload_releases_resources(
+    hass: HomeAssistant,
+    config: dict[str, Any],
+    mock_api: str,
+    boarding_passes_dir: Path,
+) -> None:
+    """Reload an entry many times against the mock API.
+
+    Tasks, sockets and memory must stay flat, or every options change would
+    leak a little more until Home Assistant is restarted.
+    """
+    assert await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {CONF_BASE_URL: mock_api}}
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=config, version=2, options={CONF_HISTORY: True}
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+
+    async def reload(times: int) -> None:
+        for _ in range(times):
+            assert await hass.config_entries.async_reload(entry.entry_id)
+            await hass.async_block_till_done()
+            assert entry.state is ConfigEntryState.LOADED
+
+    tracemalloc.start()
+    try:
+        # Memory of the loaded entry is traced from here, so only what the
+        # reloads after the warm-up leave behind counts.
+        await reload(WARM_UP_RELOADS)
+        before = resources()
+        await reload(RELOADS)
+        after = resources()
+    finally:
+        tracemalloc.stop()
+
+    # The mock API's boarding passes were rendered, outside the package.
+    assert any(boarding_passes_dir.glob("*.png"))
+    assert after.tasks <= before.tasks
+    if before.sockets is not None:
+        assert after.sockets <= before.sockets
+    assert after.objects == before.objects
+    growth = after.memory.compare_to(before.memory, "lineno")
+    assert sum(stat.size_diff for stat in growth) < MEMORY_SLACK, "\n".join(
+        map(str, growth[:10])
+    )
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()